@@ -0,0 +1,187 @@
+"""
+Offline analysis of many positions across a process pool.
+
+    python analyse.py positions.epd --depth 3 -o results.jsonl
+    cat games.fen | python analyse.py - --movetime 0.5 --ordered
+    python analyse.py positions.epd --depth 3 -o results.jsonl --resume
+
+Reads one FEN or EPD position per line from a file or stdin ("-") and
+writes one JSON object per position, in completion order by default or
+in input order with --ordered:
+
+    {"line": 12, "id": "WAC.001", "fen": "...", "move": "e2e4",
+     "score": 0.35, "depth": 3, "nodes": 4120, "time": 0.081}
+
+"line" is the input line number (blank and "#" lines count too), "id"
+comes from an EPD id opcode. Positions without moves carry "status"
+instead of a move, unreadable ones "error". Input is streamed and at
+most --max-pending positions are in flight, so memory does not grow
+with the input. After an interruption, rerun with --resume and the same
+input and output: lines already in the output are skipped.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from classes.engine_pool import init_worker, engine_analysis
+
+MAX_DEPTH = 64
+
+
+def init_analysis_worker():
+    # Ctrl-C is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    init_worker()
+
+
+def parse_line(text):
+    """(fen, id) from a FEN or EPD line, None for blank and comment lines."""
+    text = text.strip()
+    if not text or text.startswith("#"):
+        return None
+    fields = text.split()
+    if len(fields) >= 6 and fields[4].isdigit() and fields[5].isdigit():
+        return " ".join(fields[:6]), None
+    # EPD: four position fields, then "opcode operand;" pairs
+    fen = " ".join(fields[:4]) + " 0 1"
+    epd_id = None
+    for op in " ".join(fields[4:]).split(";"):
+        words = op.split(None, 1)
+        if len(words) == 2 and words[0] == "id":
+            epd_id = words[1].strip().strip('"')
+    return fen, epd_id
+
+
+def read_done(path):
+    """
+    Bitmap of line numbers already in an output file. A last line cut
+    short by the interruption is removed so appending starts cleanly.
+    """
+    done = bytearray()
+    if not os.path.exists(path):
+        return done
+    with open(path, "rb+") as f:
+        end = 0
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            end += len(raw)
+            try:
+                line = json.loads(raw)["line"]
+            except (ValueError, KeyError):
+                continue
+            if line // 8 >= len(done):
+                done.extend(bytes(line // 8 + 1 - len(done)))
+            done[line // 8] |= 1 << (line % 8)
+        f.truncate(end)
+    return done
+
+
+def is_done(done, line):
+    return line // 8 < len(done) and done[line // 8] >> (line % 8) & 1
+
+
+def analyse(source, out, args, done):
+    """Stream source through the pool into out; returns (written, skipped)."""
+    depth = args.depth or (MAX_DEPTH if args.movetime else 3)
+    pending = {}        # future -> (line, fen, id)
+    finished = {}       # line -> result, only with --ordered
+    order = deque()     # lines submitted and not yet written, only with --ordered
+    written = skipped = 0
+
+    def emit(result):
+        nonlocal written
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+        written += 1
+
+    def collect(block):
+        complete, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in complete:
+            line, fen, epd_id = pending.pop(future)
+            result = {"line": line, "id": epd_id, "fen": fen}
+            try:
+                result.update(future.result())
+            except Exception as e:      # one bad position must not stop the run
+                result["error"] = str(e) or type(e).__name__
+            if args.ordered:
+                finished[line] = result
+            else:
+                emit(result)
+        # in input order, write the finished run at the front of the queue
+        while order and order[0] in finished:
+            emit(finished.pop(order.popleft()))
+
+    executor = ProcessPoolExecutor(args.workers, initializer=init_analysis_worker)
+    try:
+        for number, text in enumerate(source, 1):
+            parsed = parse_line(text)
+            if parsed is None:
+                continue
+            if is_done(done, number):
+                skipped += 1
+                continue
+            # bounded: in order mode a slow position holds back the window
+            while len(pending) + len(finished) >= args.max_pending:
+                collect(True)
+            fen, epd_id = parsed
+            future = executor.submit(engine_analysis, fen, depth, args.movetime)
+            pending[future] = (number, fen, epd_id)
+            if args.ordered:
+                order.append(number)
+            collect(False)
+        while pending:
+            collect(True)
+    finally:
+        executor.shutdown(cancel_futures=True)
+    return written, skipped
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Analyse FEN/EPD positions in parallel")
+    ap.add_argument("input", help='FEN/EPD file, "-" for stdin')
+    ap.add_argument("-o", "--output", default="-", help='JSONL output file, "-" for stdout')
+    limit = ap.add_mutually_exclusive_group()
+    limit.add_argument("--depth", type=int, help="search depth per position (default 3)")
+    limit.add_argument("--movetime", type=float, help="seconds per position")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--max-pending", type=int, help="positions in flight (default 4 per worker)")
+    ap.add_argument("--ordered", action="store_true", help="write results in input order")
+    ap.add_argument("--resume", action="store_true", help="skip lines already in the output file")
+    args = ap.parse_args(argv)
+    if args.max_pending is None:
+        args.max_pending = 4 * args.workers
+    if args.resume and args.output == "-":
+        ap.error("--resume needs an output file")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    done = read_done(args.output) if args.resume else bytearray()
+    source = sys.stdin if args.input == "-" else open(args.input)
+    out = sys.stdout if args.output == "-" else open(args.output, "a" if args.resume else "w")
+    start = time.perf_counter()
+    try:
+        written, skipped = analyse(source, out, args, done)
+    except KeyboardInterrupt:
+        print("interrupted, rerun with --resume to continue", file=sys.stderr)
+        return 130
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    secs = time.perf_counter() - start
+    print(f"{written} positions in {secs:.1f} s ({written / secs if secs else 0:.1f}/s),"
+          f" {skipped} skipped", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Memory the search holds per node, measured with tracemalloc.
+
+    python -m benchmarks.allocations [depth]
+
+At sampled leaves a snapshot counts the blocks allocated by the engine
+(classes/) that are still alive, which is what every node on the path
+from the root keeps while its children are searched: move lists, child
+positions, encoded boards. Dividing by the length of that path gives
+blocks and bytes per node. Also prints the tracemalloc peak of a whole
+search and the untraced search speed.
+"""
+import sys
+import time
+import tracemalloc
+
+from classes.ai_player import AI_Player
+from classes.position import Position, COLOR_NAMES
+from benchmarks.positions import SUITE
+
+SAMPLE_EVERY = 97     # leaves between snapshots
+ENGINE_FILES = tracemalloc.Filter(True, "*/classes/*")
+
+
+def _instrument(ai, samples):
+    # wrap the recursive methods to know the path length at each leaf
+    path = [0]
+    calls = [0]
+    search, quiesce = ai._search, ai._quiesce
+
+    def nested(fn):
+        def wrapper(*args):
+            path[0] += 1
+            try:
+                return fn(*args)
+            finally:
+                path[0] -= 1
+        return wrapper
+
+    def leaf(*args):
+        calls[0] += 1
+        if calls[0] % SAMPLE_EVERY == 0:
+            snap = tracemalloc.take_snapshot().filter_traces([ENGINE_FILES])
+            stats = snap.statistics("filename")
+            samples.append((sum(s.count for s in stats), sum(s.size for s in stats),
+                            path[0] + 1))
+        return nested(quiesce)(*args)
+
+    ai._search = nested(search)
+    ai._quiesce = leaf
+
+
+def run(depth):
+    blocks = size = peak = nodes = 0
+    secs = 0.0
+    samples = []
+    for _, _, fen in SUITE:
+        pos = Position.from_fen(fen)
+        ai = AI_Player(COLOR_NAMES[pos.side], depth)
+        ai.search_position(pos)                # warm up, lazily built buffers exist after this
+        ai.nodes = 0
+        start = time.perf_counter()
+        ai.search_position(pos)
+        secs += time.perf_counter() - start
+        nodes += ai.nodes
+
+        _instrument(ai, samples)
+        tracemalloc.start()
+        ai.search_position(pos)
+        peak += tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    for count, nbytes, length in samples:
+        blocks += count / length
+        size += nbytes / length
+    n = max(len(samples), 1)
+    return blocks / n, size / n, peak / len(SUITE), nodes / secs, len(samples)
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    blocks, size, peak, nps, samples = run(depth)
+    print(f"depth {depth}, {samples} leaf samples over {len(SUITE)} positions")
+    print(f"  live engine blocks per node on the path  {blocks:8.1f}")
+    print(f"  live engine bytes per node on the path   {size:8.0f}")
+    print(f"  tracemalloc peak per search (kB)         {peak / 1024:8.0f}")
+    print(f"  nodes per second, untraced               {nps:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
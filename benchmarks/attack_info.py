@@ -0,0 +1,53 @@
+"""
+How often the search works out moves and attacks per node, from cProfile.
+
+    python -m benchmarks.attack_info [depth]
+
+Runs the position suite under the profiler and counts calls of every
+function that walks the pieces of a position: AttackInfo.compute, which
+generates each piece's moves once for the node, and the older
+per-square helpers (in_check, is_attacked) that the search should no
+longer reach. Passes when there is at most one compute per node.
+"""
+import cProfile
+import pstats
+import sys
+
+from classes.ai_player import AI_Player
+from classes.position import Position, COLOR_NAMES
+from benchmarks.positions import SUITE
+
+COUNTED = ("compute", "in_check", "is_attacked")
+
+
+def run(depth):
+    calls = dict.fromkeys(COUNTED, 0)
+    nodes = 0
+    for _, _, fen in SUITE:
+        pos = Position.from_fen(fen)
+        ai = AI_Player(COLOR_NAMES[pos.side], depth)
+        moves = ai._get_all_moves(pos)    # root moves, outside the profile
+        profiler = cProfile.Profile()
+        profiler.runcall(ai.search_position, pos, moves)
+        nodes += ai.nodes
+        for (filename, _, name), stat in pstats.Stats(profiler).stats.items():
+            if name in calls and filename.endswith("movegen.py"):
+                calls[name] += stat[1]      # primitive calls
+    return nodes, calls
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    nodes, calls = run(depth)
+    print(f"depth {depth}, {nodes} nodes over {len(SUITE)} positions")
+    for name in COUNTED:
+        print(f"  {name:14}{calls[name]:9d} calls  {calls[name] / nodes:6.2f} per node")
+    # in_check is left for en passant captures, which are still tried with make()
+    ok = calls["compute"] <= nodes
+    print("ok: each piece's moves are generated at most once per node" if ok
+          else "FAIL: moves generated more than once per node")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Lazy evaluation on the fixed position suite: share of scalar leaf
+evaluations that exit before mobility, search time with and without it,
+and whether the chosen moves stay the same.
+
+    python -m benchmarks.lazy_eval [depth]
+
+Runs with batched frontier scoring off as well, since that is where
+nearly every leaf goes through evaluate_board.
+"""
+import sys
+import time
+
+from classes.ai_player import AI_Player
+from classes.position import Position, COLOR_NAMES
+from benchmarks.positions import SUITE
+
+
+def run(depth, batch_leaves, lazy, count_evals=False):
+    nodes = evals = exits = 0
+    secs = 0.0
+    moves = []
+    for _, _, fen in SUITE:
+        pos = Position.from_fen(fen)
+        ai = AI_Player(COLOR_NAMES[pos.side], depth)
+        ai.batch_leaves = batch_leaves
+        ai.use_lazy_eval = lazy
+        if count_evals:
+            calls = [0]
+            full = ai.evaluate_board
+
+            def counted(*args):
+                calls[0] += 1
+                return full(*args)
+            ai.evaluate_board = counted
+        start = time.perf_counter()
+        _, move = ai.search_position(pos)
+        secs += time.perf_counter() - start
+        nodes += ai.nodes
+        exits += ai.lazy_exits
+        evals += calls[0] if count_evals else 0
+        moves.append(move)
+    return nodes, evals, exits, secs, moves
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"depth {depth}")
+    print(f"{'batch leaves':14}{'lazy':>6}{'nodes':>9}{'evals':>9}{'early exit':>12}"
+          f"{'time s':>9}{'speedup':>9}{'same move':>11}")
+    for batch_leaves in (False, True):
+        base = None
+        for lazy in (False, True):
+            # counting wraps evaluate_board, so time a separate run
+            _, evals, exits, _, _ = run(depth, batch_leaves, lazy, count_evals=True)
+            nodes, _, _, secs, moves = run(depth, batch_leaves, lazy)
+            if base is None:
+                base = secs, moves
+            share = exits / evals if evals else 0.0
+            same = sum(a == b for a, b in zip(moves, base[1]))
+            print(f"{str(batch_leaves):14}{'on' if lazy else 'off':>6}{nodes:9d}{evals:9d}"
+                  f"{share:11.1%} {secs:9.2f}{base[0] / secs:8.2f}x{same:6d}/{len(SUITE):<4}")
+
+
+if __name__ == "__main__":
+    main()
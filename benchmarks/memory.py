@@ -0,0 +1,74 @@
+"""
+Memory cost of a position: board_state of Piece objects vs the compact
+Position used by the engine.
+
+    python -m benchmarks.memory
+"""
+import copy
+import tracemalloc
+
+from classes.board import Board
+from classes.position import Position, encode_move
+from classes import movegen
+
+N = 2000
+
+
+def _legacy_board_state():
+    # Board without a screen, only board_state is needed here
+    board = Board.__new__(Board)
+    board.board_state = [[None]*8 for _ in range(8)]
+    board.initialize_board()
+    return board.board_state
+
+
+def _legacy_node(board_state):
+    # what AI_Player._simulate used to do for every child
+    new_state = copy.deepcopy(board_state)
+    piece = new_state[6][4]
+    new_state[6][4] = None
+    new_state[4][4] = piece
+    piece.position = (4, 4)
+    piece.first_move = False
+    return new_state
+
+
+def _measure(fn):
+    """Average bytes and memory blocks retained per call of fn."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [fn() for _ in range(N)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    size = sum(s.size_diff for s in stats)
+    blocks = sum(s.count_diff for s in stats)
+    del kept
+    return size / N, blocks / N
+
+
+def main():
+    board_state = _legacy_board_state()
+    pos = Position.initial()
+    e2e4 = encode_move(52, 36)
+
+    rows = [
+        ("position copy", lambda: copy.deepcopy(board_state), pos.copy),
+        ("search node", lambda: _legacy_node(board_state), lambda: pos.play(e2e4)),
+    ]
+    print(f"{'':16}{'before B':>10}{'blocks':>8}{'after B':>10}{'blocks':>8}")
+    for label, old, new in rows:
+        ob, oc = _measure(old)
+        nb, nc = _measure(new)
+        print(f"{label:16}{ob:10.0f}{oc:8.1f}{nb:10.0f}{nc:8.1f}")
+
+    # move generation for a node also allocates, count it separately
+    tracemalloc.start()
+    movegen.legal_moves(pos)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\npeak bytes generating legal moves at the start position: {peak}")
+
+
+if __name__ == "__main__":
+    main()
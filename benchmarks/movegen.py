@@ -0,0 +1,62 @@
+"""
+Move generation speed: Piece.possible_moves on board_state vs the table
+driven AttackInfo.compute and generate_legal on the compact Position.
+
+    python -m benchmarks.movegen
+"""
+import timeit
+
+from classes.position import Position, WHITE, encode_move, parse_square
+from classes import movegen
+
+REPEAT = 2000
+
+# Italian game after 1.e4 e5 2.Nf3 Nc6 3.Bc4 Bc5 4.d3 d6 5.O-O Nf6
+LINE = ["e2e4", "e7e5", "g1f3", "b8c6", "f1c4", "f8c5",
+        "d2d3", "d7d6", "e1g1", "g8f6"]
+
+
+def _positions():
+    pos = Position.initial()
+    yield "start", pos
+    for mv in LINE:
+        pos = pos.play(encode_move(parse_square(mv[:2]), parse_square(mv[2:])))
+    yield "middlegame", pos
+
+
+def main():
+    print(f"{'position':12}{'pieces us':>12}{'tables us':>12}{'speedup':>9}{'legal us':>12}")
+    for label, pos in _positions():
+        board_state = pos.to_board_state()
+        pieces = [p for row in board_state for p in row if p]
+        info = movegen.AttackInfo().compute(pos)
+        buf = movegen.new_buffer()
+
+        # same destinations from both generators for the side to move
+        start = 0
+        for i in range(info.pieces):
+            r, c = divmod(info.froms[i], 8)
+            assert sorted(board_state[r][c].possible_moves(board_state)) == sorted(
+                divmod(to, 8) for to in info.targets[start:info.ends[i]])
+            start = info.ends[i]
+
+        # compute also marks every square the opponent attacks, so it is
+        # timed against the moves of all pieces
+        old = timeit.timeit(lambda: [p.possible_moves(board_state) for p in pieces],
+                            number=REPEAT) / REPEAT
+        new = timeit.timeit(lambda: info.compute(pos), number=REPEAT) / REPEAT
+        legal = timeit.timeit(lambda: movegen.generate_legal(pos, buf), number=REPEAT) / REPEAT
+        print(f"{label:12}{old * 1e6:12.1f}{new * 1e6:12.1f}{old / new:8.1f}x{legal * 1e6:12.1f}")
+
+        # check detection, the other hot path: scan every enemy piece's
+        # moves (Game._is_in_check) vs probing attack tables from the king
+        king = next(p for p in pieces if p.type == "king" and p.color == "white")
+        enemies = [p for p in pieces if p.color == "black"]
+        old = timeit.timeit(lambda: any(king.position in p.possible_moves(board_state)
+                                        for p in enemies), number=REPEAT) / REPEAT
+        new = timeit.timeit(lambda: movegen.in_check(pos, WHITE), number=REPEAT) / REPEAT
+        print(f"{'  in check':12}{old * 1e6:12.1f}{new * 1e6:12.1f}{old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
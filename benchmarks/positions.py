@@ -0,0 +1,15 @@
+# Loaded here, before any benchmark times its first case, so that case
+# does not include the numpy import and batch_eval's table setup
+from classes import batch_eval  # noqa: F401
+
+# Fixed position suite shared by the search benchmarks: (label, phase, fen)
+SUITE = [
+    ("open game", "opening", "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2"),
+    ("italian", "opening", "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/3P1N2/PPP2PPP/RNBQ1RK1 b kq - 0 5"),
+    ("kiwipete", "middlegame", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"),
+    ("queens gambit", "middlegame", "r2q1rk1/pp2bppp/2n1pn2/3p4/3P4/2NBPN2/PP3PPP/R2Q1RK1 w - - 0 10"),
+    ("tactics", "middlegame", "r1b1k2r/ppppnppp/2n2q2/2b5/3NP3/2P1B3/PP3PPP/RN1QKB1R w KQkq - 0 7"),
+    ("rook ending", "endgame", "8/5pk1/6p1/8/3R4/6P1/5PK1/1r6 w - - 0 40"),
+    ("pawn ending", "endgame", "8/8/4k3/3p4/3P4/4K3/8/8 w - - 0 50"),
+    ("queen ending", "endgame", "6k1/5pp1/8/8/8/8/5PP1/3Q2K1 w - - 0 45"),
+]
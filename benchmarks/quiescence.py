@@ -0,0 +1,53 @@
+"""
+Quiescence search on the fixed position suite: nodes in the main search
+and in the capture search, time, and how often the move matches a
+deeper reference search.
+
+    python -m benchmarks.quiescence [max depth]
+
+The reference is a search one ply deeper than max depth with
+quiescence on, the move a user would otherwise get by picking a harder
+level.
+"""
+import sys
+import time
+
+from classes.ai_player import AI_Player
+from classes.position import Position, COLOR_NAMES
+from benchmarks.positions import SUITE
+
+
+def run(depth, quiescence):
+    main_nodes = q_nodes = 0
+    secs = 0.0
+    moves = []
+    for _, _, fen in SUITE:
+        pos = Position.from_fen(fen)
+        ai = AI_Player(COLOR_NAMES[pos.side], depth)
+        ai.use_quiescence = quiescence
+        start = time.perf_counter()
+        _, move = ai.search_position(pos)
+        secs += time.perf_counter() - start
+        main_nodes += ai.nodes - ai.qnodes
+        q_nodes += ai.qnodes
+        moves.append(move)
+    return main_nodes, q_nodes, secs, moves
+
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    reference = run(max_depth + 1, True)[3]
+    print(f"reference: depth {max_depth + 1} with quiescence")
+    print(f"{'depth':>5}{'qsearch':>9}{'main nodes':>12}{'q nodes':>10}{'q share':>9}"
+          f"{'time s':>9}{'as reference':>14}")
+    for depth in range(1, max_depth + 1):
+        for quiescence in (False, True):
+            main_nodes, q_nodes, secs, moves = run(depth, quiescence)
+            share = q_nodes / (main_nodes + q_nodes)
+            same = sum(a == b for a, b in zip(moves, reference))
+            print(f"{depth:5d}{'on' if quiescence else 'off':>9}{main_nodes:12d}{q_nodes:10d}"
+                  f"{share:9.0%}{secs:9.2f}{same:9d}/{len(SUITE)}")
+
+
+if __name__ == "__main__":
+    main()
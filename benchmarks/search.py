@@ -0,0 +1,140 @@
+"""
+Search benchmark with stored baselines, to gate engine changes.
+
+Runs AI_Player.compute_move at each difficulty level over the fixed
+position suite and records wall time, nodes, NPS, peak memory and the
+chosen move. Compares against a saved JSON baseline and exits 1 when
+nodes, time or memory regress past the thresholds, or when there is no
+baseline to compare with.
+
+    python -m benchmarks.search                 # compare with the baseline
+    python -m benchmarks.search --save          # write a new baseline
+    python -m benchmarks.search --levels 1 2 --time-threshold 0.5
+
+Node counts are deterministic, wall time depends on the machine, so
+save a baseline on the machine that runs the gate.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from classes.ai_player import AI_Player
+from classes.position import Position, COLOR_NAMES, encode_move, move_name
+from benchmarks.positions import SUITE
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "search.json")
+LEVELS = (1, 2, 3)
+
+
+def run_case(fen, level, trace_memory):
+    pos = Position.from_fen(fen)
+    board = SimpleNamespace(board_state=pos.to_board_state())
+    ai = AI_Player(COLOR_NAMES[pos.side], level)
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    move = ai.compute_move(board)
+    wall = time.perf_counter() - start
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    (sr, sc), (dr, dc), promo = move
+    return {
+        "wall": wall,
+        "nodes": ai.nodes,
+        "nps": ai.nodes / wall if wall > 0 else 0.0,
+        "move": move_name(encode_move(sr * 8 + sc, dr * 8 + dc, promo)),
+        "peak_kb": peak / 1024,
+    }
+
+
+def run(levels):
+    results = {}
+    for level in levels:
+        for label, phase, fen in SUITE:
+            # time without tracemalloc, it slows allocation-heavy code a lot
+            case = run_case(fen, level, False)
+            case["peak_kb"] = run_case(fen, level, True)["peak_kb"]
+            case["phase"] = phase
+            results[f"{label}@{level}"] = case
+    return results
+
+
+def compare(results, baseline, args):
+    """Print a comparison table and return the list of regressions."""
+    failures = []
+    print(f"{'case':22}{'nodes':>9}{'base':>9}{'wall ms':>9}{'base':>9}"
+          f"{'nps':>8}{'peak kB':>9}{'base':>8}  move")
+    for name, cur in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:22}{cur['nodes']:9d}{'-':>9}{cur['wall'] * 1000:9.0f}{'-':>9}"
+                  f"{cur['nps']:8.0f}{cur['peak_kb']:9.0f}{'-':>8}  {cur['move']}")
+            continue
+        moved = "" if cur["move"] == old["move"] else f" (was {old['move']})"
+        print(f"{name:22}{cur['nodes']:9d}{old['nodes']:9d}{cur['wall'] * 1000:9.0f}"
+              f"{old['wall'] * 1000:9.0f}{cur['nps']:8.0f}{cur['peak_kb']:9.0f}"
+              f"{old['peak_kb']:8.0f}  {cur['move']}{moved}")
+        if cur["nodes"] > old["nodes"] * (1 + args.node_threshold):
+            failures.append(f"{name}: nodes {old['nodes']} -> {cur['nodes']}")
+        if cur["peak_kb"] > old["peak_kb"] * (1 + args.memory_threshold):
+            failures.append(f"{name}: peak {old['peak_kb']:.0f} -> {cur['peak_kb']:.0f} kB")
+        if args.strict_moves and moved:
+            failures.append(f"{name}: move {old['move']} -> {cur['move']}")
+
+    # wall time is compared on the suite total, single cases are too noisy
+    shared = [n for n in results if n in baseline]
+    if shared:
+        now = sum(results[n]["wall"] for n in shared)
+        then = sum(baseline[n]["wall"] for n in shared)
+        print(f"\ntotal wall {now:.2f} s, baseline {then:.2f} s ({(now / then - 1) * 100:+.0f}%)")
+        if now > then * (1 + args.time_threshold):
+            failures.append(f"total wall {then:.2f} -> {now:.2f} s")
+    return failures
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="AI search benchmark")
+    ap.add_argument("--levels", type=int, nargs="+", default=list(LEVELS))
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--save", action="store_true", help="store this run as the baseline")
+    ap.add_argument("--node-threshold", type=float, default=0.05)
+    ap.add_argument("--time-threshold", type=float, default=0.25)
+    ap.add_argument("--memory-threshold", type=float, default=0.25)
+    ap.add_argument("--strict-moves", action="store_true", help="fail when a chosen move changes")
+    args = ap.parse_args(argv)
+
+    # a gate without a baseline would pass every regression
+    if not args.save and not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}, run with --save first")
+        return 1
+
+    results = run(args.levels)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print(f"saved {len(results)} cases to {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    failures = compare(results, baseline, args)
+    if failures:
+        print("\nREGRESSION")
+        for line in failures:
+            print("  " + line)
+        return 1
+    print("\nok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Node counts of the selective search parts on a fixed position suite.
+Each configuration is compared with plain alpha-beta (everything off):
+same best move and score difference are the playing strength check.
+
+    python -m benchmarks.selective [depth]
+"""
+import sys
+import time
+
+from classes.ai_player import AI_Player
+from classes.position import Position, COLOR_NAMES, move_name
+from benchmarks.positions import SUITE
+
+CONFIGS = [
+    ("alpha-beta", dict(use_pvs=False, use_aspiration=False, use_null_move=False, use_lmr=False)),
+    ("+pvs", dict(use_pvs=True, use_aspiration=False, use_null_move=False, use_lmr=False)),
+    ("+aspiration", dict(use_pvs=False, use_aspiration=True, use_null_move=False, use_lmr=False)),
+    ("+null move", dict(use_pvs=False, use_aspiration=False, use_null_move=True, use_lmr=False)),
+    ("+lmr", dict(use_pvs=False, use_aspiration=False, use_null_move=False, use_lmr=True)),
+    ("all", dict(use_pvs=True, use_aspiration=True, use_null_move=True, use_lmr=True)),
+    ("default", {}),
+]
+
+
+def run(depth, switches):
+    results = []
+    for label, _, fen in SUITE:
+        pos = Position.from_fen(fen)
+        ai = AI_Player(COLOR_NAMES[pos.side], depth)
+        for key, value in switches.items():
+            setattr(ai, key, value)
+        ai.nodes = 0
+        start = time.perf_counter()
+        score, move = ai.search_position(pos)
+        results.append((label, ai.nodes, time.perf_counter() - start, score, move))
+    return results
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    baseline = None
+    print(f"depth {depth}")
+    print(f"{'config':14}{'nodes':>10}{'time s':>9}{'same move':>11}{'max |dscore|':>14}")
+    for name, switches in CONFIGS:
+        results = run(depth, switches)
+        if baseline is None:
+            baseline = results
+        nodes = sum(r[1] for r in results)
+        secs = sum(r[2] for r in results)
+        same = sum(r[4] == b[4] for r, b in zip(results, baseline))
+        drift = max(abs(r[3] - b[3]) for r, b in zip(results, baseline))
+        print(f"{name:14}{nodes:10d}{secs:9.2f}{same:6d}/{len(SUITE):<4}{drift:14.2f}")
+
+    print("\nper position, defaults vs alpha-beta:")
+    for r, b in zip(results, baseline):
+        print(f"  {r[0]:13}{b[1]:9d} -> {r[1]:<9d}{move_name(b[4])} / {move_name(r[4])}")
+
+
+if __name__ == "__main__":
+    main()
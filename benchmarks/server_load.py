@@ -0,0 +1,117 @@
+"""
+Load test for server.py: simulated clients play random legal moves
+against the AI over the line protocol and time every request.
+
+    python -m benchmarks.server_load [--clients 32] [--moves 20] [--depth 1]
+
+The server runs in its own process with its engine pool, so the clients
+do not share an event loop or a GIL with it. The pool is warmed before
+the server starts listening, and the AI moves are counted with the stats
+command before and after the timed run, so warm-up jobs are left out.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+import statistics
+import time
+
+from classes.engine_pool import EnginePool
+from classes.position import Position, move_name
+from classes import movegen
+import server
+
+
+def serve(workers, max_pending, ready, stop):
+    """Server process: warm the pool, report the port on ready, run until stop is set."""
+    async def main():
+        pool = EnginePool(workers, max_pending)
+        pool.start()
+        await asyncio.gather(*(pool.submit(f"warm{i}", Position.initial().fen(), 1)
+                               for i in range(workers)))
+        game_server = server.GameServer(pool)
+        listener = await asyncio.start_server(game_server.handle_client, "127.0.0.1", 0)
+        ready.put(listener.sockets[0].getsockname()[1])
+        await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+        listener.close()
+        pool.close()
+    asyncio.run(main())
+
+
+async def client(port, moves, depth, rng, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def request(line):
+        start = time.perf_counter()
+        writer.write((line + "\n").encode())
+        await writer.drain()
+        reply = (await reader.readline()).decode().split()
+        latencies.append(time.perf_counter() - start)
+        return reply
+
+    reply = await request(f"new white {depth}")
+    sid = reply[1]
+    for _ in range(moves):
+        status, fen = reply[-7], " ".join(reply[-6:])
+        if status != "ongoing":
+            break
+        legal = movegen.legal_moves(Position.from_fen(fen))
+        reply = await request(f"move {sid} {move_name(rng.choice(legal))}")
+        if reply[0] != "ok":
+            raise RuntimeError(" ".join(reply))
+    await request(f"close {sid}")
+    writer.close()
+
+
+async def completed(port):
+    # AI moves the server's pool has finished so far
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"stats\n")
+    reply = (await reader.readline()).decode().split()
+    writer.close()
+    return int(reply[reply.index("completed") + 1])
+
+
+async def run(args, port):
+    before = await completed(port)
+    latencies = []
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, args.moves, args.depth,
+                                  random.Random(rng.random()), latencies)
+                           for _ in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    ai_moves = await completed(port) - before
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"clients {args.clients}, workers {args.workers}, depth {args.depth}")
+    print(f"requests     {len(latencies)} in {elapsed:.2f} s")
+    print(f"moves/sec    {ai_moves / elapsed:.1f} AI moves, {len(latencies) / elapsed:.1f} requests")
+    print(f"latency ms   p50 {statistics.median(latencies) * 1000:.1f}"
+          f"  p99 {p99 * 1000:.1f}  max {latencies[-1] * 1000:.1f}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=32)
+    ap.add_argument("--moves", type=int, default=20)
+    ap.add_argument("--depth", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=2)
+    ap.add_argument("--max-pending", type=int, default=64)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    ready, stop = ctx.Queue(), ctx.Event()
+    process = ctx.Process(target=serve, args=(args.workers, args.max_pending, ready, stop))
+    process.start()
+    try:
+        asyncio.run(run(args, ready.get()))
+    finally:
+        stop.set()
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,3 +2,4 @@ from .game import Game
 from .board import Board
 from .piece import Piece, Pawn
 from .ai_player import AI_Player
+from .position import Position
@@ -1,7 +1,44 @@
 import time
 import math
-import copy
-from classes.piece import Pawn
+import hashlib
+from classes.position import (
+    Position, COLOR_CODES, COLOR_MASK, TYPE_MASK, ZOBRIST_SIDE, ZOBRIST_EP,
+    EMPTY, PAWN, QUEEN, KING, move_from, move_to, move_promo, move_to_coords,
+)
+from classes import movegen, eval_weights
+
+# selective search tuning
+NULL_WINDOW = 0.01        # below the 0.05 evaluation granularity
+ASPIRATION_WINDOW = 0.5
+NULL_MOVE_R = 2
+NULL_MOVE_MIN_DEPTH = 3
+LMR_MIN_DEPTH = 3
+LMR_REDUCTION = 2         # keeps the depth parity, the evaluation swings between plies
+LMR_MIN_INDEX = 3
+
+# lazy evaluation: on the benchmark suite mobility and check move a
+# quiescence stand-pat score by at most 2.05 (1.15 for 99% of them, the
+# queen ending needs the most), so lazy exits leave nodes and moves as
+# they are (benchmarks/lazy_eval.py). Measured with the default weights,
+# tuned ones scale it
+LAZY_MARGIN = 2.1
+
+# quiescence: captures that cannot lift the score to alpha even with this
+# much positional gain on top of the captured piece are skipped
+DELTA_MARGIN = 2.0
+
+# move buffers are preallocated for this many plies, quiescence included
+MAX_PLY = 128
+
+# part of the analysis store fingerprint: bump it with any change that
+# alters search results, stored results of other versions are dropped
+ENGINE_VERSION = 1
+
+# base material values indexed by piece type
+PIECE_VALUES = (0.0, 1.0, 3.0, 3.0, 5.0, 9.0, 1000.0)
+
+class SearchAborted(Exception):
+    """Raised inside the search once a stop, time or node limit is hit."""
 
 class AI_Player:
     def __init__(self, color, difficulty_level=3):
@@ -9,148 +46,519 @@ class AI_Player:
         self.difficulty_level = difficulty_level
         self.evaluation_score = 0.0
         self.ai_decision_time = 0.0
+        self.nodes = 0
 
         # For checking bonuses
-        self.center_squares = {(3,3),(3,4),(4,3),(4,4)}
+        self.center_squares = {27, 28, 35, 36}
+
+        # evaluation weights and piece_values, tuned ones from
+        # eval_weights.json when it exists
+        self.set_weights(eval_weights.load())
+
+        # score frontier children with one vectorised call and use the
+        # same scores to order moves further up the tree
+        self.batch_leaves = True
+
+        # selective search, each part can be switched off on its own to
+        # measure what it saves (benchmarks/selective.py). Null move and
+        # LMR act at nodes of depth 3 and more, so only from search depth
+        # 4 on, where they save nodes at the same moves. Aspiration
+        # windows cost nodes at every depth measured, iterating up to the
+        # depth outweighs the narrower window, so they are off
+        self.use_pvs = True
+        self.use_aspiration = False
+        self.use_null_move = True
+        self.use_lmr = True
+
+        # leaves far outside the window skip mobility and the check test
+        self.use_lazy_eval = True
+        self.lazy_exits = 0
+
+        # leaves are resolved with a capture-only search instead of being
+        # scored in the middle of an exchange; qnodes counts its share
+        # of nodes
+        self.use_quiescence = True
+        self.qnodes = 0
+
+        # search limits, set per search_position call; stopped may be set
+        # from another thread (uci.py) to end the search early
+        self.stopped = False
+        self._deadline = None
+        self._node_limit = None
+
+        # optional AnalysisStore, results shared across games and processes
+        self.store = None
+
+        # reused by every search: one move buffer per ply, numpy views of
+        # them and the board matrix batch scoring writes children into
+        # (built when first needed), and the exchange board for SEE
+        self._moves = [movegen.new_buffer() for _ in range(MAX_PLY)]
+        self._move_views = [None] * MAX_PLY
+        self._boards = None
+        self._squares_view = None      # (squares, numpy view of them)
+        self._see_board = bytearray(64)
+
+        # attack info per ply, computed once per node for move generation,
+        # legality and evaluation; the extra one is for evaluate_board
+        # calls from outside the search
+        self._infos = [movegen.AttackInfo() for _ in range(MAX_PLY + 1)]
+        self._eval_info = movegen.AttackInfo()
 
     def compute_move(self, board):
         start_time = time.time()
-        depth = self.difficulty_level
-        alpha, beta = -math.inf, math.inf
+        self.nodes = 0
+        self.qnodes = 0
+        self.lazy_exits = 0
+        self.stopped = False
         best_val, best_move = -math.inf, None
 
-        for move in self._get_all_moves(board.board_state, self.color):
-            new_state = self._simulate(board.board_state, move)
-            val = self._minimax(new_state, depth - 1, alpha, beta, False)
+        # search runs on the compact position, copies are plain bytes copies
+        pos = Position.from_board_state(board.board_state, self.color)
+        moves = self._get_all_moves(pos)
+        stored = self.store.lookup(pos.key, self.difficulty_level) if self.store and moves else None
+        if stored and stored[1] in moves:
+            # checking the move also guards against a key collision
+            best_val, best_move = stored
+        elif moves:
+            best_val, best_move = self.search_position(pos, moves)
+            if self.store and not self.stopped:
+                self.store.store(pos.key, best_move, best_val, self.difficulty_level)
+
+        self.evaluation_score = best_val
+        self.ai_decision_time = time.time() - start_time
+        if best_move is None:
+            return None
+        # ((sr, sc), (dr, dc), promotion type or 0)
+        return (*move_to_coords(best_move), move_promo(best_move))
+
+    def search_position(self, pos, moves=None, depth=None, movetime=None,
+                        nodes=None, on_iteration=None):
+        """
+        (score, move) for the side to move. depth defaults to
+        difficulty_level; movetime (seconds), nodes or stopped end the
+        search early with the result of the last finished iteration.
+        on_iteration(depth, score, move) is called after each iteration.
+        """
+        # searched in place with make/unmake, the caller's position is untouched
+        work = pos.copy()
+        if moves is None:
+            moves = self._get_all_moves(work)
+        moves = self._order_root(work, moves)
+        depth = depth or self.difficulty_level
+        start = time.perf_counter()
+        self._deadline = start + movetime if movetime else None
+        self._node_limit = nodes
+
+        # iterative deepening feeds the aspiration window, puts the previous
+        # best move first and leaves a result when a limit cuts the search.
+        # The evaluation swings between odd and even depths, so the window
+        # is centred on the score from two iterations back
+        limited = movetime or nodes or on_iteration
+        scores = {}
+        score, move = None, None
+        try:
+            for d in range(1 if self.use_aspiration or limited else depth, depth + 1):
+                guess = scores.get(d - 2)
+                if guess is None or abs(guess) >= 500:
+                    result = self._search_root(work, moves, d, -math.inf, math.inf)
+                else:
+                    # widen only the side that failed, doubling each time
+                    delta = ASPIRATION_WINDOW
+                    alpha, beta = guess - delta, guess + delta
+                    while True:
+                        result = self._search_root(work, moves, d, alpha, beta)
+                        if result[0] <= alpha:
+                            alpha = result[0] - delta
+                        elif result[0] >= beta:
+                            beta = result[0] + delta
+                        else:
+                            break
+                        delta *= 2
+                score, move = result
+                scores[d] = score
+                moves.sort(key=lambda mv: mv != move)
+                if on_iteration:
+                    on_iteration(d, score, move)
+        except SearchAborted:
+            if move is None:
+                # not even depth 1 finished, fall back to the best ordered
+                # move; work was left mid-search, so play it on pos
+                move = moves[0]
+                score = -self._score(pos.play(move))
+        finally:
+            self._deadline = self._node_limit = None
+        return score, move
+
+    def search_multipv(self, pos, count, depth=None):
+        """The count best moves for the side to move as [(score, move)], best first."""
+        depth = depth or self.difficulty_level
+        results = []
+        work = pos.copy()
+        key = work.key
+        for move in self._order_root(work, self._get_all_moves(work)):
+            # a move only has to be searched exactly if it can enter the top count
+            floor = results[-1][0] if len(results) >= count else -math.inf
+            undo = work.make(move)
+            val = -self._search(work, depth - 1, -math.inf, -floor, True, 1)
+            work.unmake(move, undo, key)
+            if val > floor:
+                results.append((val, move))
+                results.sort(key=lambda r: -r[0])
+                del results[count:]
+        return results
+
+    def _check_limits(self):
+        if (self.stopped
+                or self._deadline is not None and time.perf_counter() >= self._deadline
+                or self._node_limit is not None and self.nodes >= self._node_limit):
+            raise SearchAborted
+
+    def _search_root(self, pos, moves, depth, alpha, beta):
+        best_val, best_move = -math.inf, None
+        exact_below = self._exact_children(depth)
+        key = pos.key
+        for i, move in enumerate(moves):
+            undo = pos.make(move)
+            if i == 0 or not self.use_pvs or exact_below:
+                val = -self._search(pos, depth - 1, -beta, -alpha, True, 1)
+            else:
+                val = -self._search(pos, depth - 1, -alpha - NULL_WINDOW, -alpha, True, 1)
+                if alpha < val < beta:
+                    val = -self._search(pos, depth - 1, -beta, -alpha, True, 1)
+            pos.unmake(move, undo, key)
             if val > best_val:
                 best_val, best_move = val, move
             alpha = max(alpha, best_val)
             if beta <= alpha:
                 break
+        return best_val, best_move
 
-        self.evaluation_score = best_val
-        self.ai_decision_time = time.time() - start_time
-        return best_move
-
-    def _minimax(self, state, depth, alpha, beta, maximizing):
-        if depth == 0:
-            return self.evaluate_board(state)
-
-        player = self.color if maximizing else ("black" if self.color=="white" else "white")
-        moves = self._get_all_moves(state, player)
-        if not moves:
-            return self.evaluate_board(state)
-
-        if maximizing:
-            value = -math.inf
-            for mv in moves:
-                child = self._simulate(state, mv)
-                value = max(value, self._minimax(child, depth-1, alpha, beta, False))
-                alpha = max(alpha, value)
+    def _search(self, state, depth, alpha, beta, allow_null, ply):
+        # negamax: scores are from the side to move's point of view.
+        # state is the one position of the whole search, moves are made
+        # and unmade on it and listed in the preallocated buffer of the ply
+        self.nodes += 1
+        self._check_limits()
+        if depth <= 0:
+            if self.use_quiescence:
+                self.nodes -= 1     # counted again as a quiescence node
+                return self._quiesce(state, alpha, beta, ply)
+            return self._score(state, alpha, beta)
+
+        moves = self._moves[ply]
+        info = self._infos[ply]
+        n = movegen.generate_legal(state, moves, info)
+        if not n:
+            # mate or stalemate, scored exactly for _exact_children
+            return self._score(state, info=info)
+        key = state.key
+
+        if depth == 1 and self.batch_leaves:
+            # frontier node: every child is a leaf, score them all at once
+            scores = self._batch_scores(state, ply, n)
+            if state.side != COLOR_CODES[self.color]:
+                scores = -scores
+            if not self.use_quiescence:
+                self.nodes += n
+                return float(scores.max())
+            # the static scores are the children's stand-pat values,
+            # best first so the capture searches see a narrow window
+            best = -math.inf
+            for i in scores.argsort()[::-1]:
+                mv = moves[i]
+                undo = state.make(mv)
+                val = -self._quiesce(state, -beta, -alpha, ply + 1, -float(scores[i]))
+                state.unmake(mv, undo, key)
+                best = max(best, val)
+                alpha = max(alpha, val)
                 if alpha >= beta:
                     break
-            return value
-        else:
-            value = math.inf
-            for mv in moves:
-                child = self._simulate(state, mv)
-                value = min(value, self._minimax(child, depth-1, alpha, beta, True))
-                beta = min(beta, value)
-                if beta <= alpha:
+            return best
+
+        in_chk = info.checks > 0
+
+        # null move: if passing still fails high the node is cut. Skipped
+        # in check and with only king and pawns left, where zugzwang is common
+        if (self.use_null_move and allow_null and depth >= NULL_MOVE_MIN_DEPTH and not in_chk
+                and self._has_pieces(state)):
+            ep = state.ep
+            state.side ^= COLOR_MASK
+            state.ep = -1
+            state.key = key ^ ZOBRIST_SIDE ^ ZOBRIST_EP[ep % 8 if ep >= 0 else -1]
+            val = -self._search(state, depth - 1 - NULL_MOVE_R, -beta, -beta + NULL_WINDOW,
+                                False, ply + 1)
+            state.side ^= COLOR_MASK
+            state.ep = ep
+            state.key = key
+            if val >= beta:
+                return val
+
+        exact_below = self._exact_children(depth)
+        lmr = self.use_lmr and depth >= LMR_MIN_DEPTH and not in_chk
+
+        if self.batch_leaves and n > 1:
+            self._order(state, ply, n)
+        best = -math.inf
+        for i in range(n):
+            mv = moves[i]
+            # late quiet moves are searched one ply shallower first
+            quiet = lmr and i >= LMR_MIN_INDEX and self._is_quiet(state, mv)
+            undo = state.make(mv)
+            # the child's attack info, which its own search then reuses
+            r = LMR_REDUCTION if quiet and not self._infos[ply + 1].update(state).checks else 0
+            if i > 0 and (self.use_pvs or r):
+                lo = -alpha - NULL_WINDOW if self.use_pvs else -beta
+                val = -self._search(state, depth - 1 - r, lo, -alpha, True, ply + 1)
+                if val > alpha and (r or (val < beta and not exact_below)):
+                    val = -self._search(state, depth - 1, -beta, -alpha, True, ply + 1)
+            else:
+                val = -self._search(state, depth - 1, -beta, -alpha, True, ply + 1)
+            state.unmake(mv, undo, key)
+            best = max(best, val)
+            alpha = max(alpha, val)
+            if alpha >= beta:
+                break
+        return best
+
+    def _exact_children(self, depth):
+        # whether the children of a node at depth come back exact whatever
+        # the window, so a null window search of them never needs
+        # repeating: frontier nodes scored in one batch, or leaves without
+        # lazy exits. Capture searches below them depend on the window
+        if self.use_quiescence:
+            return False
+        if self.batch_leaves and depth == 2:
+            return True
+        return depth <= 1 and not self.use_lazy_eval
+
+    def _quiesce(self, pos, alpha, beta, ply, stand=None):
+        # captures only, until the position is quiet. stand is the static
+        # score when the caller already has it
+        self.nodes += 1
+        self.qnodes += 1
+        self._check_limits()
+        info = self._infos[ply]
+        if stand is None:
+            # a lazy exit may only cut: stand pat raises alpha and feeds
+            # delta pruning, where a bound in place of the score misleads
+            stand = self._score(pos, -math.inf, beta, info)
+        if stand >= beta or ply >= MAX_PLY:
+            return stand
+        best = stand
+        alpha = max(alpha, stand)
+
+        squares = pos.squares
+        key = pos.key
+        values = self.piece_values
+        moves = self._moves[ply]
+        n = movegen.generate_captures(pos, moves, info)
+        for i in range(n):
+            # most valuable victim first, least valuable attacker among
+            # equals: pick the best remaining move and shift the ones
+            # before it up, a stable selection sort in the buffer
+            pick, pick_rank = i, -1
+            for j in range(i, n):
+                mv = moves[j]
+                rank = (squares[mv & 63] & TYPE_MASK) * 8 - (squares[(mv >> 6) & 63] & TYPE_MASK)
+                if rank > pick_rank:
+                    pick, pick_rank = j, rank
+            mv = moves[pick]
+            for j in range(pick, i, -1):
+                moves[j] = moves[j - 1]
+            moves[i] = mv
+
+            gain = values[squares[mv & 63] & TYPE_MASK]
+            if mv >> 12:
+                gain += values[QUEEN] - values[PAWN]
+            if stand + gain + DELTA_MARGIN <= alpha:
+                continue
+            if self._see(squares, mv) < 0:
+                continue
+            undo = pos.make(mv)
+            val = -self._quiesce(pos, -beta, -alpha, ply + 1)
+            pos.unmake(mv, undo, key)
+            if val > best:
+                best = val
+                alpha = max(alpha, val)
+                if alpha >= beta:
                     break
-            return value
-
-    def _get_all_moves(self, board_state, color):
-        moves = []
-        for r in range(8):
-            for c in range(8):
-                p = board_state[r][c]
-                if p and p.color == color:
-                    for dest in p.possible_moves(board_state):
-                        simulated = self._simulate(board_state, ((r, c), dest))
-                        if not self._is_in_check(color, simulated):
-                            moves.append(((r, c), dest))
-        return moves
-
-    def _simulate(self, board_state, move):
-        new_state = copy.deepcopy(board_state)
-        (sr, sc), (dr, dc) = move
-        piece = new_state[sr][sc]
-        new_state[sr][sc] = None
-        new_state[dr][dc] = piece
-        piece.position = (dr, dc)
-        if isinstance(piece, Pawn):
-            piece.first_move = False
-        return new_state
-
-    def evaluate_board(self, board_state):
-        # Base material values
-        values = {
-            "pawn":   1.0,
-            "knight": 3.0,
-            "bishop": 3.0,
-            "rook":   5.0,
-            "queen":  9.0,
-            "king": 1000.0
-        }
+        return best
 
-        score = 0.0
-        my_moves, opp_moves = 0, 0
+    def _see(self, squares, move):
+        """
+        Static exchange evaluation: material the mover ends up with if
+        both sides keep recapturing on the target square with their
+        least valuable attacker and may stop whenever it pays.
+        """
+        values = self.piece_values
+        frm, to, promo = (move >> 6) & 63, move & 63, move >> 12
+        piece = squares[frm]
+        on_square = values[promo] if promo else values[piece & TYPE_MASK]
+        gain = [values[squares[to] & TYPE_MASK] + (on_square - values[PAWN] if promo else 0)]
+        if gain[0] >= on_square:
+            # losing the capturer afterwards still breaks even, a lower
+            # bound is enough to tell the capture is not losing
+            return gain[0] - on_square
+        sq = self._see_board
+        sq[:] = squares
+        sq[frm] = EMPTY
+        side = (piece & COLOR_MASK) ^ COLOR_MASK
+        while True:
+            # removed attackers uncover the sliders behind them
+            frm = movegen.least_attacker(sq, to, side)
+            if frm < 0:
+                break
+            # stop once neither side can improve by going on
+            if max(-gain[-1], on_square - gain[-1]) < 0:
+                break
+            gain.append(on_square - gain[-1])
+            on_square = values[sq[frm] & TYPE_MASK]
+            sq[frm] = EMPTY
+            side ^= COLOR_MASK
+        for i in range(len(gain) - 1, 0, -1):
+            gain[i - 1] = -max(-gain[i - 1], gain[i])
+        return gain[0]
 
-        for r in range(8):
-            for c in range(8):
-                p = board_state[r][c]
-                if not p: continue
-                base = values.get(p.type, 0.0)
+    def _score(self, pos, alpha=-math.inf, beta=math.inf, info=None):
+        # window and result from the side to move's point of view
+        if pos.side == COLOR_CODES[self.color]:
+            return self.evaluate_board(pos, alpha, beta, info)
+        return -self.evaluate_board(pos, -beta, -alpha, info)
 
-                # material
-                if p.color == self.color:
-                    score += base
-                else:
-                    score -= base
+    def _has_pieces(self, pos):
+        # anything besides king and pawns for the side to move
+        side = pos.side
+        for p in pos.squares:
+            if p and p & COLOR_MASK == side and p & TYPE_MASK not in (PAWN, KING):
+                return True
+        return False
 
-                # center control bonus
-                if (r, c) in self.center_squares:
-                    bonus = 0.1
-                    score += bonus if p.color == self.color else -bonus
+    def _is_quiet(self, pos, move):
+        to = move_to(move)
+        if pos.squares[to] or move_promo(move):
+            return False
+        return not (to == pos.ep and pos.squares[move_from(move)] & TYPE_MASK == PAWN)
 
-                # mobility count
-                moves = p.possible_moves(board_state)
-                if p.color == self.color:
-                    my_moves += len(moves)
-                else:
-                    opp_moves += len(moves)
+    def _get_all_moves(self, pos):
+        # legal moves for the side to move in pos
+        return movegen.legal_moves(pos)
 
-        # mobility encourages more options
-        score += 0.05 * (my_moves - opp_moves)
+    def _order_root(self, pos, moves):
+        # root moves as a list, best static score for the mover first when batching
+        buf = self._moves[0]
+        for i, mv in enumerate(moves):
+            buf[i] = mv
+        if self.batch_leaves and len(moves) > 1:
+            self._order(pos, 0, len(moves))
+        return buf[:len(moves)].tolist()
 
-        # bonus if opp king is in check
-        opp_color = "black" if self.color=="white" else "white"
-        if self._is_in_check(opp_color, board_state):
-            score += 0.5
+    def _order(self, pos, ply, n):
+        # sort the ply's buffer in place, best static score for the mover first
+        scores = self._batch_scores(pos, ply, n)
+        order = scores.argsort()
+        if pos.side == COLOR_CODES[self.color]:
+            order = order[::-1]
+        view = self._move_views[ply]
+        if view is None:
+            import numpy as np
+            view = self._move_views[ply] = np.frombuffer(self._moves[ply], dtype=np.uint16)
+        view[:n] = view[:n][order]
 
-        return score
+    def _batch_scores(self, pos, ply, n):
+        # scores of the children of pos for the n moves in the ply's
+        # buffer. Each child is made, copied into the ply's preallocated
+        # board matrix and unmade. batch_eval and its tables load on the
+        # first search; numpy itself is already in, pygame imports it
+        # for pygame.surfarray
+        from classes import batch_eval
+        boards = self._boards
+        if boards is None or len(boards) < n:
+            # one matrix serves every ply, the scores are taken before
+            # the next ply fills it. Grown in steps of 64 rows
+            boards = self._boards = batch_eval.new_boards((n + 63) // 64 * 64)
+        if self._squares_view is None or self._squares_view[0] is not pos.squares:
+            import numpy as np
+            self._squares_view = (pos.squares, np.frombuffer(pos.squares, dtype=np.uint8))
+        squares = self._squares_view[1]
+        moves = self._moves[ply]
+        key = pos.key
+        for i in range(n):
+            mv = moves[i]
+            undo = pos.make(mv)
+            boards[i, :64] = squares
+            pos.unmake(mv, undo, key)
+        return batch_eval.evaluate_encoded(boards[:n], self.color, self.weights)
+
+    def set_weights(self, weights):
+        """Use an eval_weights dict for evaluation, SEE and delta pruning."""
+        self.weights = weights
+        self.piece_values = (0.0, weights["pawn"], weights["knight"], weights["bishop"],
+                             weights["rook"], weights["queen"], PIECE_VALUES[KING])
+        self.center_bonus = weights["center"]
+        self.mobility_weight = weights["mobility"]
+        self.check_bonus = weights["check"]
+        # the margin has to cover what mobility and check can add
+        defaults = eval_weights.DEFAULTS
+        self.lazy_margin = LAZY_MARGIN * max(abs(self.mobility_weight) / defaults["mobility"],
+                                             abs(self.check_bonus) / defaults["check"])
 
-    def _find_king(self, color, board_state):
-        for r in range(8):
-            for c in range(8):
-                p = board_state[r][c]
-                if p and p.type == "king" and p.color == color:
-                    return (r, c)
-        return None
+    def fingerprint(self):
+        """64-bit id of the engine version and weights, for stored results."""
+        data = repr((ENGINE_VERSION, eval_weights.key(self.weights))).encode()
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
 
-    def _is_in_check(self, color, board_state):
+    def evaluate_board(self, pos, alpha=-math.inf, beta=math.inf, info=None):
         """
-        True if 'color' king is attacked in board_state.
+        Static score from self.color's point of view. Terms are added
+        cheapest first; once the score is outside (alpha, beta) by more
+        than the remaining terms can move it, a bound is returned instead
+        (fail soft, like the search). Mobility and check come from info,
+        the node's AttackInfo, computed here if it is not already.
         """
-        king_pos = self._find_king(color, board_state)
-        if not king_pos:
-            return False
-        opp = "black" if color=="white" else "white"
-        for r in range(8):
-            for c in range(8):
-                p = board_state[r][c]
-                if p and p.color == opp:
-                    if king_pos in p.possible_moves(board_state):
-                        return True
-        return False
+        # Base material values
+        values = self.piece_values
+        margin = self.lazy_margin
+        check_bonus = self.check_bonus
+
+        # tier 1: material and center control, a plain scan of the squares
+        score = 0.0
+        me = COLOR_CODES[self.color]
+        squares = pos.squares
+        for sq in range(64):
+            p = squares[sq]
+            if not p: continue
+            base = values[p & TYPE_MASK]
+            mine = (p & COLOR_MASK) == me
+
+            # material
+            if mine:
+                score += base
+            else:
+                score -= base
+
+            # center control bonus
+            if sq in self.center_squares:
+                bonus = self.center_bonus
+                score += bonus if mine else -bonus
+
+        if self.use_lazy_eval:
+            if score + margin <= alpha:
+                self.lazy_exits += 1
+                return score + margin
+            if score - margin >= beta:
+                self.lazy_exits += 1
+                return score - margin
+
+        # tier 2: mobility, which encourages more options, and a bonus if
+        # the opp king is in check, both read off the node's attack info
+        info = (info or self._eval_info).update(pos)
+        if pos.side == me:
+            score += self.mobility_weight * (info.mobility - info.opp_mobility)
+            if info.gives_check:
+                score += check_bonus
+        else:
+            score += self.mobility_weight * (info.opp_mobility - info.mobility)
+            if info.checks:
+                score += check_bonus
+
+        return score
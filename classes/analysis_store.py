@@ -0,0 +1,161 @@
+import os
+import struct
+
+try:
+    import fcntl
+except ImportError:      # Windows: no cross-process locking, one game at a time
+    fcntl = None
+
+DEFAULT_PATH = os.path.join(".cache", "analysis.bin")
+MAX_ENTRIES = 200_000
+
+# the file starts with a header whose generation changes on every
+# compaction and whose fingerprint names the engine and weights the
+# results come from, then holds one record per stored search: position
+# key, score, best move, depth
+HEADER = struct.Struct("<8sQQ")
+MAGIC = b"CHESSAN2"
+RECORD = struct.Struct("<QdHB")
+
+
+class AnalysisStore:
+    """
+    Search results shared by every game process on the machine.
+
+    The file is an append-only log of fixed-size records after a small
+    header; the last record for a key wins when it is at least as deep
+    as what is already known. Each process keeps the log indexed in a
+    dict and reads only the tail that other processes appended since its
+    last look. Once the log reaches twice max_entries records it is
+    rewritten with the deepest, most recent max_entries positions and
+    swapped in with os.replace.
+
+    Writers and compaction take an exclusive flock on a side lock file,
+    readers a shared one, so a process never sees a half-written record
+    or a half-compacted file.
+
+    A log written with another fingerprint (AI_Player.fingerprint: engine
+    version and evaluation weights) reads as empty and the next store
+    starts it over, so results of other weights are never returned.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=MAX_ENTRIES, fingerprint=0):
+        self.path = path
+        self.max_entries = max_entries
+        self.fingerprint = fingerprint
+        self.entries = {}        # key -> (depth, score, move)
+        self.records = 0         # records in the log, stale ones included
+        self._generation = None
+        self._offset = HEADER.size
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock_fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+
+    def lookup(self, key, depth):
+        """(score, move) stored for key at depth or deeper, else None."""
+        self._lock(False)
+        try:
+            self._refresh()
+        finally:
+            self._unlock()
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < depth:
+            return None
+        return entry[1], entry[2]
+
+    def store(self, key, move, score, depth):
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] >= depth:
+            return
+        self._lock(True)
+        try:
+            self._refresh()
+            # write at the end of the last whole record, which also drops
+            # a partial one left by a process that died mid-write
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o644)
+            try:
+                if self._generation is None:
+                    self._generation = 0
+                    os.write(fd, HEADER.pack(MAGIC, 0, self.fingerprint))
+                os.lseek(fd, self._offset, os.SEEK_SET)
+                os.write(fd, RECORD.pack(key, score, move, depth))
+                self._offset += RECORD.size
+                os.ftruncate(fd, self._offset)
+            finally:
+                os.close(fd)
+            self.records += 1
+            self._index(key, depth, score, move)
+            # the log never grows past twice the bound, so compactions
+            # are rare and their cost is spread over max_entries stores
+            if self.records >= 2 * self.max_entries:
+                self._compact()
+        finally:
+            self._unlock()
+
+    def _index(self, key, depth, score, move):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= depth:
+            # re-insert so dict order stays oldest-written first
+            self.entries.pop(key, None)
+            self.entries[key] = (depth, score, move)
+
+    def _refresh(self):
+        """Pick up records other processes appended, or reload after a compaction."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            self._reset(None)
+            return
+        with f:
+            header = f.read(HEADER.size)
+            magic, generation, fingerprint = (HEADER.unpack(header) if len(header) == HEADER.size
+                                              else (None, None, None))
+            if magic != MAGIC or fingerprint != self.fingerprint:
+                # empty, foreign or another engine's file, the next store starts it over
+                self._reset(None)
+                return
+            if generation != self._generation:
+                self._reset(generation)
+            f.seek(self._offset)
+            data = f.read()
+        # a record cut short by a crash is ignored and overwritten by the next store
+        usable = len(data) - len(data) % RECORD.size
+        for key, score, move, depth in RECORD.iter_unpack(data[:usable]):
+            self._index(key, depth, score, move)
+        self.records += usable // RECORD.size
+        self._offset += usable
+
+    def _reset(self, generation):
+        self.entries = {}
+        self.records = 0
+        self._generation = generation
+        self._offset = HEADER.size
+
+    def _compact(self):
+        # keep the deepest results, most recently written first among equals
+        order = list(self.entries.items())
+        keep = sorted(range(len(order)), key=lambda i: (order[i][1][0], i),
+                      reverse=True)[:self.max_entries]
+        keep.sort()
+        self.entries = {order[i][0]: order[i][1] for i in keep}
+        self._generation += 1
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self._generation, self.fingerprint))
+            f.write(b"".join(RECORD.pack(key, score, move, depth)
+                             for key, (depth, score, move) in self.entries.items()))
+        os.replace(tmp, self.path)
+        self.records = len(self.entries)
+        self._offset = HEADER.size + self.records * RECORD.size
+
+    def _lock(self, exclusive):
+        if fcntl:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    def _unlock(self):
+        if fcntl:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def close(self):
+        os.close(self._lock_fd)
@@ -0,0 +1,217 @@
+from functools import lru_cache
+
+import numpy as np
+
+from classes.position import (
+    PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE, BLACK, TYPE_MASK, COLOR_MASK,
+)
+from classes import movegen, eval_weights
+
+# Vectorised version of AI_Player.evaluate_board for many positions at
+# once. Positions are stacked into an N x 65 uint8 array (column 64 is an
+# off-board wall square) and every term is computed with array ops, so
+# scoring all children of a frontier node is one call instead of N.
+
+WALL = 0xFF
+VALUES = {PAWN: 1.0, KNIGHT: 3.0, BISHOP: 3.0, ROOK: 5.0, QUEEN: 9.0, KING: 1000.0}
+CENTER_BONUS = 0.1
+MOBILITY_WEIGHT = 0.05
+CHECK_BONUS = 0.5
+CENTER_SQUARES = (27, 28, 35, 36)
+
+
+
+def piece_square_table(values, center_bonus):
+    """
+    Piece-square table from white's point of view: material + center
+    bonus, indexed [code, square]. values maps piece type to value.
+    """
+    table = np.zeros((256, 64))
+    for kind, value in values.items():
+        table[WHITE | kind] = value
+        table[BLACK | kind] = -value
+        for sq in CENTER_SQUARES:
+            table[WHITE | kind, sq] += center_bonus
+            table[BLACK | kind, sq] -= center_bonus
+    return table
+
+
+PIECE_SQUARE = piece_square_table(VALUES, CENTER_BONUS)
+
+
+@lru_cache(maxsize=8)
+def _weighted(key):
+    # (piece-square table, mobility weight, check bonus) for eval_weights.key()
+    w = dict(zip(eval_weights.NAMES, key))
+    values = {PAWN: w["pawn"], KNIGHT: w["knight"], BISHOP: w["bishop"], ROOK: w["rook"],
+              QUEEN: w["queen"], KING: VALUES[KING]}
+    return piece_square_table(values, w["center"]), w["mobility"], w["check"]
+
+
+def _matrix(table):
+    # 64 x 64 0/1 matrix, row = from square, column = target square
+    m = np.zeros((64, 64))
+    for sq, targets in enumerate(table):
+        m[sq, list(targets)] = 1.0
+    return m
+
+
+KNIGHT_MATRIX = _matrix(movegen.KNIGHT_TARGETS)
+KING_MATRIX = _matrix(movegen.KING_TARGETS)
+PAWN_MATRIX = {color: _matrix(movegen.PAWN_ATTACKS[color]) for color in (WHITE, BLACK)}
+
+# RAY_STEPS[k-1][d, sq] is the square k steps from sq in direction d,
+# or 64 (the wall) once the ray leaves the board
+_DIRS = movegen.ROOK_DIRS + movegen.BISHOP_DIRS
+RAY_STEPS = np.full((7, 8, 64), 64, dtype=np.intp)
+for _d, (_dr, _dc) in enumerate(_DIRS):
+    for _sq in range(64):
+        _r, _c = divmod(_sq, 8)
+        for _k in range(1, 8):
+            _rr, _cc = _r + _dr * _k, _c + _dc * _k
+            if not (0 <= _rr < 8 and 0 <= _cc < 8):
+                break
+            RAY_STEPS[_k - 1, _d, _sq] = _rr * 8 + _cc
+ORTHOGONAL = np.array([True] * 4 + [False] * 4)
+
+
+def encode(positions):
+    """Stack positions into an N x 65 uint8 array, last column is the wall."""
+    n = len(positions)
+    boards = np.full((n, 65), WALL, dtype=np.uint8)
+    boards[:, :64] = np.frombuffer(b"".join(bytes(p.squares) for p in positions),
+                                   dtype=np.uint8).reshape(n, 64)
+    return boards
+
+
+def new_boards(n):
+    """Empty N x 65 board matrix with the wall column set, for filling in place."""
+    boards = np.zeros((n, 65), dtype=np.uint8)
+    boards[:, 64] = WALL
+    return boards
+
+
+def evaluate_batch(positions, color, weights=None):
+    """Scores of positions from color's point of view, same terms as evaluate_board."""
+    return evaluate_encoded(encode(positions), color, weights)
+
+
+def evaluate_encoded(boards, color, weights=None):
+    """
+    Scores of encoded boards from color's point of view. weights is an
+    eval_weights dict, the built-in defaults when None.
+    """
+    if weights is None:
+        table, mobility_weight, check_bonus = PIECE_SQUARE, MOBILITY_WEIGHT, CHECK_BONUS
+    else:
+        table, mobility_weight, check_bonus = _weighted(eval_weights.key(weights))
+    me = WHITE if color in (WHITE, "white") else BLACK
+
+    # material and center bonus through the piece-square table
+    score = table[boards[:, :64], np.arange(64)].sum(axis=1)
+    mobility, attacks = _mobility(boards, (me,))
+    score += mobility_weight * mobility
+    if me == BLACK:
+        score = -score
+    return score + check_bonus * attacks[me]
+
+
+# columns of features_encoded, in eval_weights.NAMES order
+FEATURE_NAMES = eval_weights.NAMES
+
+
+def features_encoded(boards):
+    """
+    N x 8 float32 matrix of the evaluation terms from white's point of
+    view, one column per weight: piece count differences for pawn to
+    queen, center occupancy difference, mobility difference, and check
+    (1 when black's king is attacked, -1 when white's is). evaluate_encoded
+    for white is this matrix times the weights, except that it only
+    counts check by its own side.
+    """
+    board = boards[:, :64]
+    features = np.empty((len(boards), len(FEATURE_NAMES)), dtype=np.float32)
+    for i, kind in enumerate((PAWN, KNIGHT, BISHOP, ROOK, QUEEN)):
+        features[:, i] = (np.count_nonzero(board == (WHITE | kind), axis=1)
+                          - np.count_nonzero(board == (BLACK | kind), axis=1))
+    center = board[:, list(CENTER_SQUARES)]
+    occupied = center != 0
+    features[:, 5] = (np.count_nonzero(occupied & ((center & COLOR_MASK) == WHITE), axis=1)
+                      - np.count_nonzero(occupied & ((center & COLOR_MASK) == BLACK), axis=1))
+    mobility, attacks = _mobility(boards, (WHITE, BLACK))
+    features[:, 6] = mobility
+    features[:, 7] = attacks[WHITE].astype(np.float32) - attacks[BLACK]
+    return features
+
+
+def _mobility(boards, attackers):
+    """
+    (white minus black pseudo-legal move counts, {color: whether it
+    attacks the other king} for each color in attackers) per board.
+    """
+    n = len(boards)
+    board = boards[:, :64]
+
+    occupied = board != 0
+    empty = ~occupied
+    side_of = board & COLOR_MASK
+    own = {c: occupied & (side_of == c) for c in (WHITE, BLACK)}
+    mobility = {}
+    attacks = {c: np.zeros(n, dtype=bool) for c in attackers}
+    kings = {c: board == (c ^ COLOR_MASK | KING) for c in attackers}   # the king c attacks
+
+    for c in (WHITE, BLACK):
+        not_own = ~own[c]
+        count = np.zeros(n)
+
+        # knights and kings: targets that are not own pieces
+        for kind, matrix in ((KNIGHT, KNIGHT_MATRIX), (KING, KING_MATRIX)):
+            reach = (board == (c | kind)).astype(float) @ matrix
+            count += (reach * not_own).sum(axis=1)
+            if c in attacks:
+                attacks[c] |= (reach * kings[c]).sum(axis=1) > 0
+
+        # pawns: pushes onto empty squares, captures onto enemy pieces
+        pawns = board == (c | PAWN)
+        if c == WHITE:
+            single = pawns[:, 8:] & empty[:, :56]
+            double = pawns[:, 48:56] & empty[:, 40:48] & empty[:, 32:40]
+        else:
+            single = pawns[:, :56] & empty[:, 8:]
+            double = pawns[:, 8:16] & empty[:, 16:24] & empty[:, 24:32]
+        reach = pawns.astype(float) @ PAWN_MATRIX[c]
+        count += single.sum(axis=1) + double.sum(axis=1)
+        count += (reach * own[c ^ COLOR_MASK]).sum(axis=1)
+        if c in attacks:
+            attacks[c] |= (reach * kings[c]).sum(axis=1) > 0
+
+        mobility[c] = count
+
+    # sliders of both colors at once: walk the eight rays of every slider
+    # in lock step, a ray stays alive while it only crosses empty squares
+    kinds = board & TYPE_MASK
+    pi, si = np.nonzero((kinds == BISHOP) | (kinds == ROOK) | (kinds == QUEEN))
+    if len(pi):
+        code = board[pi, si]
+        slider = (code & TYPE_MASK)[:, None]
+        color_of = (code & COLOR_MASK)[:, None]
+        enemy_king = color_of ^ COLOR_MASK | KING
+        alive = np.where(ORTHOGONAL, slider != BISHOP, slider != ROOK)
+        counts = np.zeros(len(pi))
+        hits = np.zeros(len(pi), dtype=bool)
+        rows = pi[:, None]
+        for steps in RAY_STEPS:
+            target = boards[rows, steps[:, si].T]
+            free = target == 0
+            enemy = (target != WALL) & ~free & ((target & COLOR_MASK) != color_of)
+            counts += np.count_nonzero(alive & (free | enemy), axis=1)
+            hits |= (alive & (target == enemy_king)).any(axis=1)
+            alive &= free
+            if not alive.any():
+                break
+        signed = np.where((color_of == WHITE)[:, 0], counts, -counts)
+        mobility[WHITE] += np.bincount(pi, weights=signed, minlength=n)
+        for c in attackers:
+            attacks[c] |= np.bincount(pi, weights=hits & (color_of[:, 0] == c), minlength=n) > 0
+
+    return mobility[WHITE] - mobility[BLACK], attacks
@@ -1,4 +1,4 @@
-import pygame, sys, os
+import pygame, os
 from classes.piece import Pawn, Rook, Knight, Bishop, Queen, King
 
 class Board:
@@ -11,22 +11,85 @@ class Board:
         self.piece_images = {}
         self.load_assets()
 
+    PIECE_KEYS = [f"chess-{kind}-{col}"
+                  for kind in ("bishop","king","knight","pawn","queen","rook")
+                  for col in ("black","white")]
+    ASSET_DIR = "assets"
+    CACHE_DIR = os.path.join("assets", ".cache")
+
     def load_assets(self):
-        # board bg
+        # one pre-scaled atlas per board size: board on top, a strip of
+        # piece sprites below it, decoded with a single image load
+        atlas = self._load_atlas()
+        if atlas is None:
+            atlas = self._build_atlas()
+        sz = self.square_size
+        self.board_image = atlas.subsurface((0, 0, self.width, self.height))
+        for i, key in enumerate(self.PIECE_KEYS):
+            self.piece_images[key] = atlas.subsurface((i*sz, self.height, sz, sz))
+
+    def _atlas_path(self):
+        return os.path.join(self.CACHE_DIR, f"atlas-{self.width}x{self.height}.png")
+
+    def _source_paths(self):
+        names = ["board"] + self.PIECE_KEYS
+        return [os.path.join(self.ASSET_DIR, f"{n}.png") for n in names]
+
+    def _load_atlas(self):
+        path = self._atlas_path()
+        try:
+            built = os.path.getmtime(path)
+            # stale if any source image changed after the atlas was written
+            if any(os.path.exists(src) and os.path.getmtime(src) > built
+                   for src in self._source_paths()):
+                return None
+            return self._convert(pygame.image.load(path))
+        except (OSError, pygame.error):
+            return None
+
+    def _build_atlas(self):
+        sz = self.square_size
+        atlas = pygame.Surface((max(self.width, sz*len(self.PIECE_KEYS)), self.height + sz),
+                               pygame.SRCALPHA)
+        board_src, *piece_srcs = self._source_paths()
+        complete = True
+
+        # a missing image gets a plain placeholder instead of ending the game
         try:
-            bg = pygame.image.load(os.path.join("assets","board.png"))
-            self.board_image = pygame.transform.scale(bg,(self.width,self.height))
-        except Exception as e:
-            print("Board load error:", e); sys.exit()
-
-        # piece PNGs
-        for kind in ("bishop","king","knight","pawn","queen","rook"):
-          for col in ("black","white"):
-            key = f"chess-{kind}-{col}"
-            path = os.path.join("assets", f"{key}.png")
-            img = pygame.image.load(path)
-            img = pygame.transform.scale(img,(self.square_size,self.square_size))
-            self.piece_images[key] = img
+            bg = pygame.image.load(board_src)
+            atlas.blit(pygame.transform.scale(bg,(self.width,self.height)),(0,0))
+        except (OSError, pygame.error) as e:
+            print("Board load error:", e)
+            complete = False
+            for r in range(8):
+                for c in range(8):
+                    shade = (240,217,181) if (r + c) % 2 == 0 else (181,136,99)
+                    atlas.fill(shade, (c*sz, r*sz, sz, sz))
+
+        for i, (key, path) in enumerate(zip(self.PIECE_KEYS, piece_srcs)):
+            try:
+                img = pygame.image.load(path)
+                atlas.blit(pygame.transform.scale(img,(sz,sz)),(i*sz, self.height))
+            except (OSError, pygame.error) as e:
+                print("Piece load error:", e)
+                complete = False
+                color = (255,255,255) if key.endswith("white") else (0,0,0)
+                pygame.draw.circle(atlas, color, (i*sz + sz//2, self.height + sz//2), sz//3)
+
+        # only complete atlases are cached, so a restored file gets picked up
+        if complete:
+            try:
+                os.makedirs(self.CACHE_DIR, exist_ok=True)
+                pygame.image.save(atlas, self._atlas_path())
+            except (OSError, pygame.error) as e:
+                print("Atlas cache error:", e)
+        return self._convert(atlas)
+
+    def _convert(self, surface):
+        # match the display format when there is one, blits are faster
+        if pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface
 
     def initialize_board(self):
         # Top row (black)
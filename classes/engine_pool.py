@@ -0,0 +1,130 @@
+import asyncio
+import multiprocessing
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from classes.ai_player import AI_Player
+from classes.position import Position, COLOR_NAMES, move_name
+from classes import movegen
+
+# Worker side: each pool process keeps one AI_Player warm for its lifetime
+_worker_ai = None
+
+def init_worker():
+    global _worker_ai
+    _worker_ai = AI_Player("white")
+
+def spawn_executor(workers):
+    """
+    Process pool of warm engine workers for the pygame front ends. The
+    processes are spawned, not forked: a fork would copy the window,
+    SDL's threads and the parent's locks into every worker.
+    """
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=init_worker)
+
+def engine_move(fen, depth):
+    """Best move in coordinate notation for the side to move in fen."""
+    pos = Position.from_fen(fen)
+    _worker_ai.color = COLOR_NAMES[pos.side]
+    _worker_ai.stopped = False
+    _, move = _worker_ai.search_position(pos, depth=depth)
+    return move_name(move) if move is not None else None
+
+def engine_hints(fen, depth, count):
+    """[(score, move)] of the count best moves for the side to move in fen."""
+    pos = Position.from_fen(fen)
+    _worker_ai.color = COLOR_NAMES[pos.side]
+    _worker_ai.stopped = False
+    return _worker_ai.search_multipv(pos, count, depth)
+
+def engine_analysis(fen, depth, movetime=None):
+    """
+    Search result for fen as a dict. With movetime (seconds) depth is
+    the limit and the result carries the deepest finished iteration.
+    """
+    pos = Position.from_fen(fen)
+    moves = movegen.legal_moves(pos)
+    if not moves:
+        return {"move": None, "status": "checkmate" if movegen.in_check(pos) else "stalemate"}
+    _worker_ai.color = COLOR_NAMES[pos.side]
+    _worker_ai.stopped = False
+    _worker_ai.nodes = 0
+    reached = [depth]
+    on_iteration = (lambda d, score, move: reached.__setitem__(0, d)) if movetime else None
+    start = time.perf_counter()
+    score, move = _worker_ai.search_position(pos, moves, depth=depth, movetime=movetime,
+                                             on_iteration=on_iteration)
+    return {"move": move_name(move), "score": round(score, 2), "depth": reached[0],
+            "nodes": _worker_ai.nodes, "time": round(time.perf_counter() - start, 3)}
+
+
+class EnginePool:
+    """
+    Bounded process pool for AI turns shared by many sessions.
+
+    Jobs queue per session and are dispatched round robin across sessions,
+    so one busy session cannot starve the others. At most max_pending jobs
+    wait at once; submit() blocks past that, which stops the server reading
+    from the connection and pushes back on the client.
+    """
+
+    def __init__(self, workers=2, max_pending=64):
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(workers, initializer=init_worker)
+        self.queues = OrderedDict()    # session id -> deque of jobs
+        self.capacity = asyncio.Semaphore(max_pending)
+        self.wakeup = asyncio.Event()
+        self.running = 0
+        self.completed = 0
+        self.dispatcher = None
+
+    def start(self):
+        self.dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def submit(self, session_id, fen, depth):
+        await self.capacity.acquire()
+        future = asyncio.get_running_loop().create_future()
+        self.queues.setdefault(session_id, deque()).append((fen, depth, future))
+        self.wakeup.set()
+        try:
+            return await future
+        finally:
+            self.capacity.release()
+
+    @property
+    def pending(self):
+        return sum(len(q) for q in self.queues.values())
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            while self.queues and self.running < self.workers:
+                # take the oldest session's next job, then send it to the back
+                session_id, queue = next(iter(self.queues.items()))
+                fen, depth, future = queue.popleft()
+                if queue:
+                    self.queues.move_to_end(session_id)
+                else:
+                    del self.queues[session_id]
+                self.running += 1
+                job = loop.run_in_executor(self.executor, engine_move, fen, depth)
+                job.add_done_callback(lambda done, fut=future: self._finished(done, fut))
+
+    def _finished(self, done, future):
+        self.running -= 1
+        self.completed += 1
+        if not future.cancelled():
+            if done.exception() is not None:
+                future.set_exception(done.exception())
+            else:
+                future.set_result(done.result())
+        self.wakeup.set()
+
+    def close(self):
+        if self.dispatcher is not None:
+            self.dispatcher.cancel()
+        self.executor.shutdown(cancel_futures=True)
@@ -0,0 +1,44 @@
+import json
+import os
+import sys
+
+# evaluation weights in pawns, tuned offline by tune.py. A weights file
+# holds any subset of these names; the rest keep their defaults
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "eval_weights.json")
+NAMES = ("pawn", "knight", "bishop", "rook", "queen", "center", "mobility", "check")
+DEFAULTS = {
+    "pawn": 1.0, "knight": 3.0, "bishop": 3.0, "rook": 5.0, "queen": 9.0,
+    "center": 0.1,      # per piece on d4, e4, d5, e5
+    "mobility": 0.05,   # per pseudo-legal move more than the opponent
+    "check": 0.5,       # when the opponent's king is attacked
+}
+
+
+def load(path=DEFAULT_PATH):
+    """Weights from path, the defaults when there is no such file or it cannot be read."""
+    weights = dict(DEFAULTS)
+    try:
+        with open(path) as f:
+            stored = json.load(f)
+        for name in NAMES:
+            if name in stored:
+                weights[name] = float(stored[name])
+    except FileNotFoundError:
+        return dict(DEFAULTS)
+    except (ValueError, KeyError, TypeError) as e:
+        # stderr: stdout carries the UCI protocol
+        print("Eval weights error:", e, file=sys.stderr)
+        return dict(DEFAULTS)
+    return weights
+
+
+def save(weights, path=DEFAULT_PATH):
+    with open(path, "w") as f:
+        json.dump({name: round(weights[name], 4) for name in NAMES}, f, indent=1)
+        f.write("\n")
+
+
+def key(weights):
+    """Hashable form of a weights dict, in NAMES order."""
+    return tuple(weights[name] for name in NAMES)
@@ -7,10 +7,21 @@ from classes.ui import SideMenu
 from classes.board import Board
 from classes.piece import Pawn, Rook, Knight, Bishop, Queen, King
 from classes.ai_player import AI_Player
+from classes.journal import MoveJournal
+from classes.analysis_store import AnalysisStore
+from classes.position import (
+    COLOR_NAMES, QUEEN, PIECE_CODES, PIECE_CLASSES, encode_move, move_to_coords,
+)
 
 class Game:
-    def __init__(self, screen, board_w, board_h, menu_w):
+    def __init__(self, screen, board_w, board_h, menu_w, ticks=None):
         self.screen = screen
+
+        # time source in ms; replays substitute a virtual clock
+        self.ticks = ticks or pygame.time.get_ticks
+
+        # optional SessionRecorder (classes/replay.py), told about AI moves
+        self.recorder = None
         self.board_w = board_w
         self.board_h = board_h
         self.menu_w = menu_w
@@ -23,7 +34,7 @@ class Game:
         # Game state
         self.mode = "1v1"             # "1v1" or "ai"
         self.active_player = "white"
-        self.state = "ongoing"        # "ongoing", "checkmate", "stalemate"
+        self.state = "ongoing"        # "ongoing", "checkmate", "stalemate", "draw"
         self.winner = None
         self.paused = False
 
@@ -42,17 +53,31 @@ class Game:
         self.promote = False
         self.promote_pos = None
         self.promote_color = None
+        self.promote_from = None
         self.promote_rects = []
 
+        # Move history for undo/redo and repetition
+        self.journal = MoveJournal()
+
+        # Hints: engine starts with the first toggle, then keeps
+        # prefetching on every human turn so toggling again is instant
+        self.show_hints = False
+        self.hint_engine = None
+        self.hint_overlay = None      # (position key, surface)
+
         # AI
         self.ai = AI_Player("black")
+        try:
+            self.ai.store = AnalysisStore(fingerprint=self.ai.fingerprint())
+        except OSError:
+            pass    # read-only install, play without the shared store
         self.waiting_for_ai = False
         self.ai_thinking = False
 
         # Clocks (5 minutes each)
         self.time_limit = 5 * 60
         self.clock_times = {"white": self.time_limit, "black": self.time_limit}
-        self.last_tick = pygame.time.get_ticks()
+        self.last_tick = self.ticks()
 
         # Logging fields
         self.move_count    = 0
@@ -62,6 +87,7 @@ class Game:
         self.game_start_ts = self.last_tick
         self.ai_times      = []
         self.stats_logged  = False
+        self.stats_path    = "stats.csv"
 
     def start_game(self):
         self.board.initialize_board()
@@ -73,8 +99,9 @@ class Game:
         self.promote = False
         self.waiting_for_ai = False
         self.ai_thinking = False
+        self.journal = MoveJournal()
 
-        now = pygame.time.get_ticks()
+        now = self.ticks()
         self.clock_times = {"white": self.time_limit, "black": self.time_limit}
         self.last_tick = now
 
@@ -96,7 +123,7 @@ class Game:
         self.stats_logged  = False
 
     def update_game(self):
-        now = pygame.time.get_ticks()
+        now = self.ticks()
         dt = (now - self.last_tick) / 1000.0
 
         # Tick clocks if not AI-thinking, paused, or promoting
@@ -159,6 +186,13 @@ class Game:
                 img = self.board.piece_images[p.image_key]
                 self.screen.blit(img, (x, y))
 
+        # ranked hint arrows for the player to move
+        if (self.hint_engine and self.state == "ongoing"
+                and not self.promote and not self.waiting_for_ai):
+            self.hint_engine.request(self.journal.pos)
+            if self.show_hints:
+                self._draw_hints()
+
         # highlight selection & valid moves
         if self.selected_pos:
             self._draw_selection_and_moves()
@@ -167,9 +201,9 @@ class Game:
         self.menu.draw(self.screen, self)
 
         # Endgame: log stats once, overlay text, keep board visible
-        if self.state in ("checkmate", "stalemate"):
+        if self.state in ("checkmate", "stalemate", "draw"):
             if not self.stats_logged:
-                path = "stats.csv"
+                path = self.stats_path
                 need_header = not os.path.exists(path) or os.path.getsize(path) == 0
                 with open(path, "a", newline="") as f:
                     w = csv.writer(f)
@@ -182,7 +216,7 @@ class Game:
                     mn = min(self.move_times) if self.move_times else 0
                     mx = max(self.move_times) if self.move_times else 0
                     sd = statistics.pstdev(self.move_times) if len(self.move_times) > 1 else 0
-                    duration = (pygame.time.get_ticks() - self.game_start_ts) / 1000.0
+                    duration = (self.ticks() - self.game_start_ts) / 1000.0
                     avg_ai = statistics.mean(self.ai_times) if self.ai_times else 0
                     w.writerow([
                         self.move_count,
@@ -191,8 +225,13 @@ class Game:
                     ])
                 self.stats_logged = True
 
-            font = pygame.font.SysFont(None, 64)
-            msg = "Stalemate" if self.state == "stalemate" else f"{self.winner.capitalize()} wins!"
+            font = pygame.font.Font(None, 64)
+            if self.state == "stalemate":
+                msg = "Stalemate"
+            elif self.state == "draw":
+                msg = "Draw by repetition"
+            else:
+                msg = f"{self.winner.capitalize()} wins!"
             txt = font.render(msg, True, (255, 255, 255))
             rect = txt.get_rect(center=(self.board_w//2, self.board_h//2))
             self.screen.blit(txt, rect)
@@ -208,21 +247,19 @@ class Game:
             self.ai_thinking = True
             return
         if self.waiting_for_ai and self.ai_thinking:
-            start = pygame.time.get_ticks()
+            start = self.ticks()
             mv = self.ai.compute_move(self.board)
-            think_time = (pygame.time.get_ticks() - start) / 1000.0
+            think_time = (self.ticks() - start) / 1000.0
+            if self.recorder:
+                self.recorder.ai_move(mv)
             self.clock_times[self.ai.color] -= think_time
             self.ai_times.append(think_time)
             if mv:
-                (sr, sc), (dr, dc) = mv
-                pc = self.board.board_state[sr][sc]
-                self.board.board_state[sr][sc] = None
-                self.board.board_state[dr][dc] = pc
-                pc.position = (dr, dc)
+                self._apply_ai_move(mv)
             self.active_player = "white"
             self.waiting_for_ai = False
             self.ai_thinking = False
-            self.last_tick = pygame.time.get_ticks()
+            self.last_tick = self.ticks()
 
     def process_input(self, event):
         # Sidebar
@@ -246,8 +283,16 @@ class Game:
                 self.last_hover_target = new_target
             return
 
+        # Promotion choice
+        if self.promote and not self.paused and event.type == pygame.MOUSEBUTTONDOWN:
+            for rect, cls in zip(self.promote_rects, (Queen, Rook, Bishop, Knight)):
+                if rect.collidepoint(event.pos):
+                    self._finish_promotion(cls)
+                    break
+            return
+
         # check/stalemate
-        if (self.state in ("checkmate", "stalemate")
+        if (self.state in ("checkmate", "stalemate", "draw")
                 or self.promote
                 or self.paused
                 or self.waiting_for_ai):
@@ -311,28 +356,23 @@ class Game:
                         piece.first_move = False
 
                 # log move time
-                now = pygame.time.get_ticks()
+                now = self.ticks()
                 elapsed = (now - self.last_move_ts) / 1000.0
                 self.move_times.append(elapsed)
                 self.move_count += 1
                 self.last_move_ts = now
 
-                # pawn promotion
+                # pawn promotion, recorded once the piece is chosen
                 if isinstance(piece, Pawn) and row in (0, 7):
                     self.promote = True
                     self.promote_pos = (row, col)
+                    self.promote_from = (sr, sc)
                     self.promote_color = piece.color
                     self.selected_pos = None
                     return
 
-                # switch turn
-                if self.mode == "ai":
-                    self.active_player = self.ai.color
-                    self.waiting_for_ai = True
-                    self.ai_thinking = False
-                else:
-                    self.active_player = "black" if self.active_player == "white" else "white"
-                self.last_tick = pygame.time.get_ticks()
+                self._record_move((sr, sc), (row, col))
+                self._switch_turn()
 
             # clear selection
             self.selected_pos = None
@@ -409,6 +449,125 @@ class Game:
                 valid.append((vr, vc))
         return valid
 
+    def toggle_hints(self):
+        self.show_hints = not self.show_hints
+        if self.hint_engine is None:
+            # imported here so games without hints never start the process
+            from classes.hints import HintEngine
+            self.hint_engine = HintEngine()
+
+    def _draw_hints(self):
+        hints = self.hint_engine.get(self.journal.pos)
+        if not hints:
+            return
+        key = self.journal.pos.key
+        if self.hint_overlay is None or self.hint_overlay[0] != key:
+            self.hint_overlay = (key, self._render_hints(hints))
+        self.screen.blit(self.hint_overlay[1], (self.board_offset_x, 0))
+
+    def _render_hints(self, hints):
+        # drawn once per position onto a transparent layer, then blitted
+        sz = self.board.square_size
+        layer = pygame.Surface((self.board_w, self.board_h), pygame.SRCALPHA)
+        colors = [(0, 170, 255, 190), (0, 200, 120, 160), (240, 200, 0, 140)]
+        font = pygame.font.Font(None, 28)
+        for rank in range(len(hints) - 1, -1, -1):
+            _, mv = hints[rank]
+            (sr, sc), (dr, dc) = move_to_coords(mv)
+            start = pygame.Vector2(sc*sz + sz/2, sr*sz + sz/2)
+            end = pygame.Vector2(dc*sz + sz/2, dr*sz + sz/2)
+            color = colors[min(rank, len(colors) - 1)]
+            width = max(4, sz // 8 - rank * 3)
+            direction = (end - start).normalize()
+            normal = pygame.Vector2(-direction.y, direction.x)
+            head = end - direction * sz * 0.3
+            pygame.draw.line(layer, color, start, head, width)
+            pygame.draw.polygon(layer, color, [end, head + normal * width * 1.5,
+                                               head - normal * width * 1.5])
+            label = font.render(str(rank + 1), True, (255, 255, 255))
+            layer.blit(label, label.get_rect(center=start))
+        return layer
+
+    def _switch_turn(self):
+        if self.state != "ongoing":
+            return
+        if self.mode == "ai":
+            self.active_player = self.ai.color
+            self.waiting_for_ai = True
+            self.ai_thinking = False
+        else:
+            self.active_player = "black" if self.active_player == "white" else "white"
+        self.last_tick = self.ticks()
+
+    def _finish_promotion(self, cls):
+        row, col = self.promote_pos
+        self.board.board_state[row][col] = cls(self.promote_color, (row, col))
+        self.promote = False
+        self._record_move(self.promote_from, self.promote_pos, PIECE_CODES[cls.__name__.lower()])
+        self._switch_turn()
+
+    def _record_move(self, src, dst, promo=0):
+        self.journal.push(encode_move(src[0]*8 + src[1], dst[0]*8 + dst[1], promo))
+        if self.journal.is_threefold():
+            self.state = "draw"
+
+    def undo_move(self):
+        # against the AI, step back to the human's previous turn
+        if self.waiting_for_ai:
+            return
+        self.journal.undo()
+        while self.mode == "ai" and COLOR_NAMES[self.journal.pos.side] == self.ai.color:
+            if self.journal.undo() is None:
+                break
+        self._load_journal_position()
+
+    def redo_move(self):
+        if self.waiting_for_ai:
+            return
+        self.journal.redo()
+        while (self.mode == "ai" and self.journal.can_redo()
+               and COLOR_NAMES[self.journal.pos.side] == self.ai.color):
+            self.journal.redo()
+        self._load_journal_position()
+
+    def _load_journal_position(self):
+        pos = self.journal.pos
+        self.board.board_state = pos.to_board_state()
+        self.active_player = COLOR_NAMES[pos.side]
+        self.state = "draw" if self.journal.is_threefold() else "ongoing"
+        self.winner = None
+        self.promote = False
+        self.selected_pos = None
+        self.click_anim = False
+        self.waiting_for_ai = self.mode == "ai" and self.active_player == self.ai.color
+        self.ai_thinking = False
+        self.last_tick = self.ticks()
+
+    def _apply_ai_move(self, mv):
+        (sr, sc), (dr, dc), promo = mv
+        pc = self.board.board_state[sr][sc]
+        self.board.board_state[sr][sc] = None
+        self.board.board_state[dr][dc] = pc
+        pc.position = (dr, dc)
+
+        # the engine also castles and promotes
+        if isinstance(pc, King) and abs(dc - sc) == 2:
+            rook_src, rook_dst = (7, sc + 1) if dc > sc else (0, sc - 1)
+            rook = self.board.board_state[sr][rook_src]
+            self.board.board_state[sr][rook_src] = None
+            self.board.board_state[sr][rook_dst] = rook
+            rook.position = (sr, rook_dst)
+            rook.first_move = False
+        elif isinstance(pc, Pawn) and dr in (0, 7):
+            # the piece the search chose, a queen for moves without one
+            promo = promo or QUEEN
+            self.board.board_state[dr][dc] = PIECE_CLASSES[promo](pc.color, (dr, dc))
+        else:
+            promo = 0
+        if isinstance(pc, (Pawn, Rook, King)):
+            pc.first_move = False
+        self._record_move((sr, sc), (dr, dc), promo)
+
     def _draw_promotion_ui(self):
         overlay = pygame.Surface((self.board_w + self.menu_w, self.board_h), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 160))
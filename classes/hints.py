@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor
+
+from classes.engine_pool import spawn_executor, engine_hints
+
+HINT_COUNT = 3
+HINT_DEPTH = 2
+CACHE_SIZE = 256
+
+
+class HintEngine:
+    """
+    Top moves for the player to move, computed in a background process.
+
+    Results are kept in an LRU keyed by the position's Zobrist key, so
+    showing hints again or coming back to a position (undo) is a lookup.
+    The search runs in its own process and never competes with the
+    render loop for the GIL. A search for a position the player has left
+    is cancelled so it does not queue ahead of the current one. A failed
+    search is reported once and leaves no hints for its position, so it
+    is not tried again every frame.
+    """
+
+    def __init__(self, count=HINT_COUNT, depth=HINT_DEPTH, cache_size=CACHE_SIZE):
+        self.count = count
+        self.depth = depth
+        self.cache_size = cache_size
+        self.cache = OrderedDict()   # key -> [(score, move)]
+        self.pending = {}            # key -> future
+        self.failed = False
+        self.broken = False          # the worker died, nothing more is submitted
+        self.executor = spawn_executor(1)
+
+    def request(self, pos):
+        """Start computing hints for pos unless they are cached or running."""
+        self._collect()
+        key = pos.key
+        if key in self.cache or key in self.pending or self.broken:
+            return
+        # superseded: a search not started yet is dropped, a running one
+        # finishes and still fills the cache
+        for old, future in list(self.pending.items()):
+            if future.cancel():
+                del self.pending[old]
+        self.pending[key] = self.executor.submit(engine_hints, pos.fen(), self.depth, self.count)
+
+    def get(self, pos):
+        """Cached hints for pos, empty when the search failed, None while it runs."""
+        self._collect()
+        hints = self.cache.get(pos.key)
+        if hints is not None:
+            self.cache.move_to_end(pos.key)
+        return hints
+
+    def _collect(self):
+        for key, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[key]
+            error = future.exception()
+            if error is None:
+                hints = future.result()
+            else:
+                if not self.failed:
+                    print("Hint error:", error)
+                self.failed = True
+                self.broken = self.broken or isinstance(error, BrokenExecutor)
+                hints = []
+            self.cache[key] = hints
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
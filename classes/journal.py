@@ -0,0 +1,86 @@
+from array import array
+
+from classes.position import Position
+
+
+class MoveJournal:
+    """
+    Move history of one game.
+
+    Moves are kept as 16-bit encoded moves next to make()'s 16-bit undo
+    records and the 64-bit position key before each move, so undo and redo
+    are O(1) in-place operations on the journal's Position. Positions
+    reached along the current line are counted by key, which makes the
+    threefold repetition test a dict lookup per move.
+    """
+
+    def __init__(self, pos=None):
+        self.pos = pos if pos is not None else Position.initial()
+        self.start_fen = self.pos.fen()
+        self.moves = array("H")
+        self.undos = array("H")
+        self.keys = array("Q")     # key of the position before each move
+        self.cursor = 0            # moves[:cursor] are played, the rest can be redone
+        self.counts = {self.pos.key: 1}
+
+    def __len__(self):
+        return self.cursor
+
+    def push(self, move):
+        """Play move, dropping any moves that were undone before it."""
+        del self.moves[self.cursor:]
+        del self.undos[self.cursor:]
+        del self.keys[self.cursor:]
+        self.moves.append(move)
+        self.undos.append(0)
+        self.keys.append(0)
+        self.redo()
+
+    def undo(self):
+        if self.cursor == 0:
+            return None
+        key = self.pos.key
+        self.counts[key] -= 1
+        if not self.counts[key]:
+            del self.counts[key]
+        self.cursor -= 1
+        move = self.moves[self.cursor]
+        self.pos.unmake(move, self.undos[self.cursor], self.keys[self.cursor])
+        return move
+
+    def redo(self):
+        if self.cursor == len(self.moves):
+            return None
+        move = self.moves[self.cursor]
+        self.keys[self.cursor] = self.pos.key
+        self.undos[self.cursor] = self.pos.make(move)
+        self.cursor += 1
+        self.counts[self.pos.key] = self.counts.get(self.pos.key, 0) + 1
+        return move
+
+    def can_redo(self):
+        return self.cursor < len(self.moves)
+
+    def is_threefold(self):
+        return self.counts.get(self.pos.key, 0) >= 3
+
+    def replay(self, moves):
+        """Append already validated moves, no legality checks."""
+        for move in moves:
+            self.push(move)
+
+    @classmethod
+    def from_moves(cls, moves, start_fen=None):
+        journal = cls(Position.from_fen(start_fen) if start_fen else None)
+        journal.replay(moves)
+        return journal
+
+    def to_bytes(self):
+        """Played moves as 2 bytes each, for saving a whole game."""
+        return self.moves[:self.cursor].tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, start_fen=None):
+        moves = array("H")
+        moves.frombytes(data)
+        return cls.from_moves(moves, start_fen)
@@ -0,0 +1,516 @@
+from array import array
+
+from classes.position import (
+    EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE, BLACK,
+    TYPE_MASK, COLOR_MASK,
+    WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE,
+    encode_move,
+)
+
+# Move generation on the compact Position. Same rules as the Piece
+# classes, plus castling, en passant and promotion.
+#
+# Target and ray tables are built once at import so the hot loops only
+# index tuples, no offsets or bounds checks per call.
+
+KNIGHT_OFFSETS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2),
+                  (1, -2), (1, 2), (2, -1), (2, 1))
+KING_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1),
+                (0, 1), (1, -1), (1, 0), (1, 1))
+BISHOP_DIRS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+ROOK_DIRS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+PROMOTIONS = (QUEEN, ROOK, BISHOP, KNIGHT)
+
+
+def _targets(offsets):
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        table.append(tuple((row + dr) * 8 + col + dc for dr, dc in offsets
+                           if 0 <= row + dr < 8 and 0 <= col + dc < 8))
+    return tuple(table)
+
+
+def _rays(dirs):
+    # per square, one tuple of squares per direction, nearest first
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        rays = []
+        for dr, dc in dirs:
+            ray = []
+            r, c = row + dr, col + dc
+            while 0 <= r < 8 and 0 <= c < 8:
+                ray.append(r * 8 + c)
+                r += dr
+                c += dc
+            if ray:
+                rays.append(tuple(ray))
+        table.append(tuple(rays))
+    return tuple(table)
+
+
+KNIGHT_TARGETS = _targets(KNIGHT_OFFSETS)
+KING_TARGETS = _targets(KING_OFFSETS)
+BISHOP_RAYS = _rays(BISHOP_DIRS)
+ROOK_RAYS = _rays(ROOK_DIRS)
+QUEEN_RAYS = tuple(r + b for r, b in zip(ROOK_RAYS, BISHOP_RAYS))
+SLIDER_RAYS = {BISHOP: BISHOP_RAYS, ROOK: ROOK_RAYS, QUEEN: QUEEN_RAYS}
+
+# squares a pawn of each color attacks from sq
+PAWN_ATTACKS = {WHITE: _targets(((-1, -1), (-1, 1))),
+                BLACK: _targets(((1, -1), (1, 1)))}
+# squares holding a pawn of each color that would attack sq
+PAWN_ATTACKERS = {WHITE: PAWN_ATTACKS[BLACK], BLACK: PAWN_ATTACKS[WHITE]}
+
+# per square one ray for each of the eight directions, rook directions
+# first, empty where the board ends at once
+DIRECTION_RAYS = tuple(zip(*(tuple(rays[0] if rays else () for rays in _rays((d,)))
+                             for d in ROOK_DIRS + BISHOP_DIRS)))
+
+# LINE[a * 64 + b] is 1 + the direction from a to b when they share a
+# rank, file or diagonal, else 0; BETWEEN[a * 64 + b] holds the squares
+# strictly between them on that line
+LINE = bytearray(64 * 64)
+BETWEEN = [()] * (64 * 64)
+for _a in range(64):
+    for _d, _ray in enumerate(DIRECTION_RAYS[_a]):
+        for _i, _b in enumerate(_ray):
+            LINE[_a * 64 + _b] = _d + 1
+            BETWEEN[_a * 64 + _b] = _ray[:_i]
+LINE = bytes(LINE)
+BETWEEN = tuple(BETWEEN)
+NO_SQUARES = bytes(64)
+
+
+def king_square(squares, color):
+    try:
+        return squares.index(color | KING)
+    except ValueError:
+        return -1
+
+
+def is_attacked(squares, sq, by_color):
+    """True if any piece of by_color attacks sq."""
+    pawn = by_color | PAWN
+    for frm in PAWN_ATTACKERS[by_color][sq]:
+        if squares[frm] == pawn:
+            return True
+    knight = by_color | KNIGHT
+    for frm in KNIGHT_TARGETS[sq]:
+        if squares[frm] == knight:
+            return True
+    king = by_color | KING
+    for frm in KING_TARGETS[sq]:
+        if squares[frm] == king:
+            return True
+
+    queen = by_color | QUEEN
+    for rays, slider in ((ROOK_RAYS, by_color | ROOK), (BISHOP_RAYS, by_color | BISHOP)):
+        for ray in rays[sq]:
+            for frm in ray:
+                target = squares[frm]
+                if target:
+                    if target == slider or target == queen:
+                        return True
+                    break
+    return False
+
+
+def least_attacker(squares, sq, color):
+    """Square of the least valuable piece of color attacking sq, or -1."""
+    pawn = color | PAWN
+    for frm in PAWN_ATTACKERS[color][sq]:
+        if squares[frm] == pawn:
+            return frm
+    knight = color | KNIGHT
+    for frm in KNIGHT_TARGETS[sq]:
+        if squares[frm] == knight:
+            return frm
+
+    # bishops before rooks, a queen only when neither attacks
+    queen = color | QUEEN
+    queen_sq = -1
+    for rays, slider in ((BISHOP_RAYS, color | BISHOP), (ROOK_RAYS, color | ROOK)):
+        for ray in rays[sq]:
+            for frm in ray:
+                target = squares[frm]
+                if target:
+                    if target == slider:
+                        return frm
+                    if target == queen and queen_sq < 0:
+                        queen_sq = frm
+                    break
+    if queen_sq >= 0:
+        return queen_sq
+    king = color | KING
+    for frm in KING_TARGETS[sq]:
+        if squares[frm] == king:
+            return frm
+    return -1
+
+
+def in_check(pos, color=None):
+    """True if color's king (side to move by default) is attacked."""
+    if color is None:
+        color = pos.side
+    ksq = king_square(pos.squares, color)
+    if ksq < 0:
+        return False
+    return is_attacked(pos.squares, ksq, color ^ COLOR_MASK)
+
+
+# Search code passes a preallocated array("H") and gets back how many
+# moves were written, so no list is built per node. MAX_MOVES is above
+# the most legal moves any position has (218).
+MAX_MOVES = 256
+
+
+def new_buffer():
+    return array("H", bytes(2 * MAX_MOVES))
+
+
+class AttackInfo:
+    """
+    Attack facts of one position, worked out in a single pass over its
+    pieces and then shared by move generation, the legality test and
+    evaluation of that node:
+
+    targets      destination squares of every piece of the side to move,
+                 piece by piece in square order, a pawn's pushes before
+                 its captures and a slider's rays outward from it in
+                 turn; froms[i] is the square of
+                 the i-th piece, its targets end at ends[i]
+    attacked     1 on squares the opponent attacks or defends, seen
+                 through the side to move's king so it cannot step
+                 back along a checking ray
+    checks       number of pieces giving check, and with one, evasion
+                 marks the squares that capture or block it
+    pins         per square 1 + the direction from the king of the pin
+                 holding a piece of the side to move, 0 when free
+    mobility     move counts of the side to move and of the opponent,
+    opp_mobility as evaluate_board counts them
+    gives_check  whether the side to move attacks the opponent's king
+
+    The buffers are allocated once; update() recomputes them only when
+    handed a position other than the last one (by key), so the search
+    keeps one per ply and every consumer in a node reads the same pass.
+    """
+
+    __slots__ = ("key", "king", "targets", "froms", "ends", "pieces", "attacked",
+                 "checks", "evasion", "pins", "mobility", "opp_mobility", "gives_check")
+
+    def __init__(self):
+        self.key = None
+        self.king = -1
+        self.targets = array("B", bytes(MAX_MOVES))
+        self.froms = array("B", bytes(64))
+        self.ends = array("H", bytes(128))
+        self.pieces = 0
+        self.attacked = bytearray(64)
+        self.checks = 0
+        self.evasion = bytearray(64)
+        self.pins = bytearray(64)
+        self.mobility = 0
+        self.opp_mobility = 0
+        self.gives_check = False
+
+    def update(self, pos):
+        if pos.key != self.key:
+            self.compute(pos)
+        return self
+
+    def compute(self, pos):
+        squares = pos.squares
+        side = pos.side
+        opp = side ^ COLOR_MASK
+        own_king = side | KING
+        opp_king = opp | KING
+        targets = self.targets
+        froms = self.froms
+        ends = self.ends
+        attacked = self.attacked
+        attacked[:] = NO_SQUARES
+        step = -8 if side == WHITE else 8
+        opp_step = -step
+        start_row = 6 if side == WHITE else 1
+        opp_start_row = 7 - start_row
+        n = pieces = opp_moves = 0
+        gives_check = False
+
+        for sq in range(64):
+            piece = squares[sq]
+            if not piece:
+                continue
+            kind = piece & TYPE_MASK
+
+            if piece & COLOR_MASK == side:
+                # the side to move: every destination, one piece after another
+                if kind == PAWN:
+                    to = sq + step
+                    if 0 <= to < 64:
+                        if squares[to] == EMPTY:
+                            targets[n] = to
+                            n += 1
+                            if (sq >> 3) == start_row and squares[to + step] == EMPTY:
+                                targets[n] = to + step
+                                n += 1
+                        for to in PAWN_ATTACKS[side][sq]:
+                            target = squares[to]
+                            if target and target & COLOR_MASK != side:
+                                targets[n] = to
+                                n += 1
+                                if target == opp_king:
+                                    gives_check = True
+                elif kind == KNIGHT or kind == KING:
+                    for to in (KNIGHT_TARGETS[sq] if kind == KNIGHT else KING_TARGETS[sq]):
+                        target = squares[to]
+                        if target == EMPTY or target & COLOR_MASK != side:
+                            targets[n] = to
+                            n += 1
+                            if target == opp_king:
+                                gives_check = True
+                else:
+                    for ray in SLIDER_RAYS[kind][sq]:
+                        for to in ray:
+                            target = squares[to]
+                            if target == EMPTY:
+                                targets[n] = to
+                                n += 1
+                            else:
+                                if target & COLOR_MASK != side:
+                                    targets[n] = to
+                                    n += 1
+                                    if target == opp_king:
+                                        gives_check = True
+                                break
+                froms[pieces] = sq
+                ends[pieces] = n
+                pieces += 1
+                continue
+
+            # the opponent: attacked squares and a move count
+            if kind == PAWN:
+                for to in PAWN_ATTACKS[opp][sq]:
+                    attacked[to] = 1
+                    target = squares[to]
+                    if target and target & COLOR_MASK == side:
+                        opp_moves += 1
+                to = sq + opp_step
+                if 0 <= to < 64 and squares[to] == EMPTY:
+                    opp_moves += 1
+                    if (sq >> 3) == opp_start_row and squares[to + opp_step] == EMPTY:
+                        opp_moves += 1
+            elif kind == KNIGHT or kind == KING:
+                for to in (KNIGHT_TARGETS[sq] if kind == KNIGHT else KING_TARGETS[sq]):
+                    attacked[to] = 1
+                    target = squares[to]
+                    if target == EMPTY or target & COLOR_MASK != opp:
+                        opp_moves += 1
+            else:
+                for ray in SLIDER_RAYS[kind][sq]:
+                    for to in ray:
+                        attacked[to] = 1
+                        target = squares[to]
+                        if target == EMPTY:
+                            opp_moves += 1
+                            continue
+                        if target & COLOR_MASK != opp:
+                            opp_moves += 1
+                            if target == own_king:
+                                # the square behind the king stays attacked
+                                i = ray.index(to) + 1
+                                if i < len(ray):
+                                    attacked[ray[i]] = 1
+                        break
+
+        self.key = pos.key
+        self.pieces = pieces
+        self.mobility = n
+        self.opp_mobility = opp_moves
+        self.gives_check = gives_check
+
+        # checks and pins, looking out from the king
+        pins = self.pins
+        pins[:] = NO_SQUARES
+        checks = 0
+        checker = -1
+        try:
+            ksq = squares.index(own_king)
+        except ValueError:
+            ksq = -1
+        self.king = ksq
+        if ksq >= 0:
+            pawn = opp | PAWN
+            for frm in PAWN_ATTACKERS[opp][ksq]:
+                if squares[frm] == pawn:
+                    checks += 1
+                    checker = frm
+            knight = opp | KNIGHT
+            for frm in KNIGHT_TARGETS[ksq]:
+                if squares[frm] == knight:
+                    checks += 1
+                    checker = frm
+            queen = opp | QUEEN
+            for d, ray in enumerate(DIRECTION_RAYS[ksq]):
+                slider = opp | (ROOK if d < 4 else BISHOP)
+                shield = -1
+                for frm in ray:
+                    target = squares[frm]
+                    if target == EMPTY:
+                        continue
+                    if target & COLOR_MASK == side:
+                        if shield >= 0:
+                            break
+                        shield = frm
+                        continue
+                    if target == slider or target == queen:
+                        if shield < 0:
+                            checks += 1
+                            checker = frm
+                        else:
+                            pins[shield] = d + 1
+                    break
+        self.checks = checks
+        if checks == 1:
+            evasion = self.evasion
+            evasion[:] = NO_SQUARES
+            evasion[checker] = 1
+            for sq in BETWEEN[ksq * 64 + checker]:
+                evasion[sq] = 1
+        return self
+
+
+def generate_legal(pos, buf, info=None):
+    """
+    Write the legal moves of the side to move into buf, return the
+    count. The legality test reads the position's AttackInfo (computed
+    here when not given): king moves avoid attacked squares, pinned
+    pieces stay on the pin line and in check only evasions remain. En
+    passant, which can uncover the king along the rank, is still tried
+    with make().
+    """
+    info = (info or AttackInfo()).update(pos)
+    squares = pos.squares
+    side = pos.side
+    ep = pos.ep
+    targets = info.targets
+    ends = info.ends
+    attacked = info.attacked
+    checks = info.checks
+    evasion = info.evasion
+    pins = info.pins
+    line = info.king * 64
+    n = start = 0
+    for p, sq in enumerate(info.froms[:info.pieces]):
+        end = ends[p]
+        kind = squares[sq] & TYPE_MASK
+        frm = sq << 6
+        if kind == KING:
+            for i in range(start, end):
+                to = targets[i]
+                if not attacked[to]:
+                    buf[n] = frm | to
+                    n += 1
+            if pos.castling and not checks:
+                n = _castling_legal(pos, sq, attacked, buf, n)
+        elif checks < 2:
+            pin = pins[sq]
+            promote = kind == PAWN and (sq >> 3) == (1 if side == WHITE else 6)
+            for i in range(start, end):
+                to = targets[i]
+                if pin and LINE[line + to] != pin or checks and not evasion[to]:
+                    continue
+                if promote:
+                    for promo in PROMOTIONS:
+                        buf[n] = frm | to | promo << 12
+                        n += 1
+                else:
+                    buf[n] = frm | to
+                    n += 1
+            if kind == PAWN and ep >= 0 and ep in PAWN_ATTACKS[side][sq]:
+                mv = frm | ep
+                key = pos.key
+                undo = pos.make(mv)
+                legal = not in_check(pos, side)
+                pos.unmake(mv, undo, key)
+                if legal:
+                    buf[n] = mv
+                    n += 1
+        start = end
+    return n
+
+
+def _castling_legal(pos, ksq, attacked, buf, n):
+    # castling moves of the side to move, not in check, into buf at n
+    squares = pos.squares
+    ks, qs = ((WHITE_KINGSIDE, WHITE_QUEENSIDE) if pos.side == WHITE
+              else (BLACK_KINGSIDE, BLACK_QUEENSIDE))
+    if not pos.castling & (ks | qs) or ksq != (60 if pos.side == WHITE else 4):
+        return n
+    if (pos.castling & ks and squares[ksq + 1] == EMPTY and squares[ksq + 2] == EMPTY
+            and not attacked[ksq + 1] and not attacked[ksq + 2]):
+        buf[n] = encode_move(ksq, ksq + 2)
+        n += 1
+    if (pos.castling & qs and squares[ksq - 1] == EMPTY and squares[ksq - 2] == EMPTY
+            and squares[ksq - 3] == EMPTY and not attacked[ksq - 1] and not attacked[ksq - 2]):
+        buf[n] = encode_move(ksq, ksq - 2)
+        n += 1
+    return n
+
+
+def generate_captures(pos, buf, info=None):
+    """
+    Write the legal captures and queen promotions of the side to move
+    into buf, the moves quiescence search looks at, and return the
+    count. En passant is left out. Reads the position's AttackInfo,
+    computed here when not given.
+    """
+    info = (info or AttackInfo()).update(pos)
+    squares = pos.squares
+    side = pos.side
+    targets = info.targets
+    ends = info.ends
+    attacked = info.attacked
+    checks = info.checks
+    evasion = info.evasion
+    pins = info.pins
+    line = info.king * 64
+    n = start = 0
+    for p, sq in enumerate(info.froms[:info.pieces]):
+        end = ends[p]
+        kind = squares[sq] & TYPE_MASK
+        frm = sq << 6
+        if kind == KING:
+            for i in range(start, end):
+                to = targets[i]
+                if squares[to] and not attacked[to]:
+                    buf[n] = frm | to
+                    n += 1
+        elif checks < 2:
+            pin = pins[sq]
+            promo = (QUEEN << 12 if kind == PAWN and (sq >> 3) == (1 if side == WHITE else 6)
+                     else 0)
+            push = -1
+            for i in range(start, end):
+                to = targets[i]
+                if not squares[to]:
+                    if promo:
+                        push = to
+                    continue
+                if pin and LINE[line + to] != pin or checks and not evasion[to]:
+                    continue
+                buf[n] = frm | to | promo
+                n += 1
+            # a promotion push goes after the piece's captures
+            if push >= 0 and not (pin and LINE[line + push] != pin or checks and not evasion[push]):
+                buf[n] = frm | push | promo
+                n += 1
+        start = end
+    return n
+
+
+def legal_moves(pos):
+    buf = new_buffer()
+    return buf[:generate_legal(pos, buf)].tolist()
@@ -1,4 +1,7 @@
 class Piece:
+    # slots keep each piece free of a per-instance __dict__
+    __slots__ = ("type", "color", "position", "image_key")
+
     def __init__(self, piece_type, color, position):
         self.type = piece_type
         self.color = color      # white or black
@@ -19,6 +22,8 @@ class Piece:
 
 
 class Pawn(Piece):
+    __slots__ = ("first_move",)
+
     def __init__(self, color, position):
         super().__init__("pawn", color, position)
         self.first_move = True
@@ -59,6 +64,8 @@ class Pawn(Piece):
         return moves
 
 class Knight(Piece):
+    __slots__ = ()
+
     def __init__(self, color, position):
         super().__init__("knight", color, position)
 
@@ -80,6 +87,8 @@ class Knight(Piece):
         return moves
 
 class Bishop(Piece):
+    __slots__ = ()
+
     def __init__(self, color, position):
         super().__init__("bishop", color, position)
 
@@ -106,6 +115,8 @@ class Bishop(Piece):
 
 
 class Rook(Piece):
+    __slots__ = ("first_move",)
+
     def __init__(self, color, position):
         super().__init__("rook", color, position)
         self.first_move = True
@@ -161,6 +172,8 @@ class Rook(Piece):
         return moves
 
 class Queen(Piece):
+    __slots__ = ()
+
     def __init__(self, color, position):
         super().__init__("queen", color, position)
 
@@ -193,6 +206,8 @@ class Queen(Piece):
         return moves
 
 class King(Piece):
+    __slots__ = ("first_move",)
+
     def __init__(self, color, position):
         super().__init__("king", color, position)
         self.first_move = True
@@ -0,0 +1,319 @@
+import random
+
+from classes.piece import Pawn, Rook, Knight, Bishop, Queen, King
+
+# Compact board used by the engine. A square holds 0 (empty) or
+# color | type, so a whole position is a 64 byte bytearray and copying
+# it during search is a single bytes copy instead of a deepcopy of
+# 32 Piece objects.
+EMPTY = 0
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = 1, 2, 3, 4, 5, 6
+WHITE, BLACK = 0, 8
+TYPE_MASK = 7
+COLOR_MASK = 8
+
+PIECE_NAMES = {PAWN: "pawn", KNIGHT: "knight", BISHOP: "bishop",
+               ROOK: "rook", QUEEN: "queen", KING: "king"}
+PIECE_CODES = {name: code for code, name in PIECE_NAMES.items()}
+COLOR_NAMES = {WHITE: "white", BLACK: "black"}
+COLOR_CODES = {"white": WHITE, "black": BLACK}
+_FEN_LETTERS = {PAWN: "p", KNIGHT: "n", BISHOP: "b", ROOK: "r", QUEEN: "q", KING: "k"}
+_FEN_CODES = {ch: code for code, ch in _FEN_LETTERS.items()}
+PIECE_CLASSES = {PAWN: Pawn, KNIGHT: Knight, BISHOP: Bishop,
+                 ROOK: Rook, QUEEN: Queen, KING: King}
+
+# one shared image key per piece code (flyweight for drawing)
+IMAGE_KEYS = {color | kind: f"chess-{name}-{COLOR_NAMES[color]}"
+              for kind, name in PIECE_NAMES.items() for color in (WHITE, BLACK)}
+
+# castling rights bitmask
+WHITE_KINGSIDE, WHITE_QUEENSIDE = 1, 2
+BLACK_KINGSIDE, BLACK_QUEENSIDE = 4, 8
+
+# squares are row*8 + col, row 0 being black's back rank like board_state
+def square(row, col):
+    return row * 8 + col
+
+def row_col(sq):
+    return divmod(sq, 8)
+
+# algebraic square names, "a8" is square 0 and "h1" square 63
+def square_name(sq):
+    return "abcdefgh"[sq % 8] + str(8 - sq // 8)
+
+def parse_square(name):
+    return (8 - int(name[1])) * 8 + ord(name[0]) - ord("a")
+
+# A move fits in 16 bits: from (6) | to (6) | promotion type (3)
+def encode_move(frm, to, promo=0):
+    return (frm << 6) | to | (promo << 12)
+
+def move_from(move):
+    return (move >> 6) & 63
+
+def move_to(move):
+    return move & 63
+
+def move_promo(move):
+    return move >> 12
+
+def move_name(move):
+    """Coordinate notation used by UCI, e.g. "e2e4" or "e7e8q"."""
+    promo = move_promo(move)
+    return (square_name(move_from(move)) + square_name(move_to(move))
+            + (_FEN_LETTERS[promo] if promo else ""))
+
+def move_to_coords(move):
+    """((sr, sc), (dr, dc)) form used by Game and the Piece classes."""
+    return row_col(move_from(move)), row_col(move_to(move))
+
+
+# Zobrist keys: one random 64-bit number per (piece code, square), side
+# to move, castling rights and en passant file. A position's key is the
+# xor of its features and is updated incrementally by make/unmake
+_rng = random.Random(0x5EED)
+ZOBRIST_PIECES = [[_rng.getrandbits(64) for _ in range(64)] for _ in range(16)]
+ZOBRIST_SIDE = _rng.getrandbits(64)
+ZOBRIST_CASTLING = [_rng.getrandbits(64) for _ in range(16)]
+ZOBRIST_EP = [_rng.getrandbits(64) for _ in range(8)] + [0]    # [-1] is "none"
+
+
+class Position:
+    __slots__ = ("squares", "side", "castling", "ep", "key")
+
+    def __init__(self, squares=None, side=WHITE, castling=0, ep=-1, key=None):
+        self.squares = squares if squares is not None else bytearray(64)
+        self.side = side          # WHITE or BLACK, side to move
+        self.castling = castling  # castling rights bitmask
+        self.ep = ep              # en passant target square or -1
+        self.key = key if key is not None else self.compute_key()
+
+    def copy(self):
+        return Position(self.squares[:], self.side, self.castling, self.ep, self.key)
+
+    def compute_key(self):
+        key = ZOBRIST_CASTLING[self.castling] ^ ZOBRIST_EP[self.ep % 8 if self.ep >= 0 else -1]
+        if self.side == BLACK:
+            key ^= ZOBRIST_SIDE
+        for sq, code in enumerate(self.squares):
+            if code:
+                key ^= ZOBRIST_PIECES[code][sq]
+        return key
+
+    @classmethod
+    def initial(cls):
+        sq = bytearray(64)
+        back = (ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK)
+        for c, kind in enumerate(back):
+            sq[c] = BLACK | kind
+            sq[8 + c] = BLACK | PAWN
+            sq[48 + c] = WHITE | PAWN
+            sq[56 + c] = WHITE | kind
+        return cls(sq, WHITE, 15, -1)
+
+    @classmethod
+    def from_fen(cls, fen):
+        fields = fen.split()
+        sq = bytearray(64)
+        i = 0
+        for ch in fields[0]:
+            if ch == "/":
+                continue
+            if ch.isdigit():
+                i += int(ch)
+                continue
+            sq[i] = (WHITE if ch.isupper() else BLACK) | _FEN_CODES[ch.lower()]
+            i += 1
+        side = WHITE if len(fields) < 2 or fields[1] == "w" else BLACK
+        castling = 0
+        if len(fields) > 2:
+            for ch, flag in zip("KQkq", (WHITE_KINGSIDE, WHITE_QUEENSIDE,
+                                         BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+                if ch in fields[2]:
+                    castling |= flag
+        ep = -1
+        if len(fields) > 3 and fields[3] != "-":
+            # kept only when a capture there is legal, as make() does
+            target = parse_square(fields[3])
+            mover = side ^ COLOR_MASK
+            to = target + (8 if mover == BLACK else -8)
+            if 0 <= to < 64 and sq[to] == mover | PAWN and not sq[target]:
+                ep = _ep_target(sq, 2 * target - to, to, mover)
+        return cls(sq, side, castling, ep)
+
+    def fen(self):
+        rows = []
+        for r in range(8):
+            row, gap = "", 0
+            for code in self.squares[r * 8:r * 8 + 8]:
+                if not code:
+                    gap += 1
+                    continue
+                if gap:
+                    row, gap = row + str(gap), 0
+                ch = _FEN_LETTERS[code & TYPE_MASK]
+                row += ch.upper() if code & COLOR_MASK == WHITE else ch
+            rows.append(row + (str(gap) if gap else ""))
+        castling = "".join(ch for ch, flag in zip("KQkq", (1, 2, 4, 8))
+                           if self.castling & flag) or "-"
+        ep = square_name(self.ep) if self.ep >= 0 else "-"
+        side = "w" if self.side == WHITE else "b"
+        return f"{'/'.join(rows)} {side} {castling} {ep} 0 1"
+
+    @classmethod
+    def from_board_state(cls, board_state, side="white"):
+        sq = bytearray(64)
+        for r in range(8):
+            for c in range(8):
+                p = board_state[r][c]
+                if p:
+                    sq[r * 8 + c] = COLOR_CODES[p.color] | PIECE_CODES[p.type]
+
+        # castling rights come from the first_move flags of king and rooks
+        castling = 0
+        for color, row, ks, qs in (("white", 7, WHITE_KINGSIDE, WHITE_QUEENSIDE),
+                                   ("black", 0, BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            king = board_state[row][4]
+            if not (isinstance(king, King) and king.color == color and king.first_move):
+                continue
+            for col, flag in ((7, ks), (0, qs)):
+                rook = board_state[row][col]
+                if isinstance(rook, Rook) and rook.color == color and rook.first_move:
+                    castling |= flag
+        return cls(sq, COLOR_CODES[side], castling, -1)
+
+    def to_board_state(self):
+        board_state = [[None] * 8 for _ in range(8)]
+        for i, code in enumerate(self.squares):
+            if not code:
+                continue
+            r, c = divmod(i, 8)
+            kind = code & TYPE_MASK
+            color = COLOR_NAMES[code & COLOR_MASK]
+            p = PIECE_CLASSES[kind](color, (r, c))
+            if kind == PAWN:
+                p.first_move = r == (6 if color == "white" else 1)
+            elif kind == KING:
+                rights = (WHITE_KINGSIDE | WHITE_QUEENSIDE if color == "white"
+                          else BLACK_KINGSIDE | BLACK_QUEENSIDE)
+                p.first_move = bool(self.castling & rights)
+            elif kind == ROOK:
+                p.first_move = bool(self.castling & _ROOK_RIGHTS.get(i, 0))
+            board_state[r][c] = p
+        return board_state
+
+    def play(self, move):
+        """Return the position after move; self is left untouched."""
+        child = self.copy()
+        child.make(move)
+        return child
+
+    def make(self, move):
+        """
+        Play move in place. Returns a 16-bit undo record (captured piece,
+        previous castling rights and en passant square) for unmake.
+        """
+        sq = self.squares
+        frm, to, promo = (move >> 6) & 63, move & 63, move >> 12
+        piece = sq[frm]
+        kind = piece & TYPE_MASK
+        captured = sq[to]
+        undo = captured | (self.castling << 4) | ((self.ep + 1) << 8)
+        z = ZOBRIST_PIECES
+        key = self.key ^ z[piece][frm]
+
+        sq[frm] = EMPTY
+        if captured:
+            key ^= z[captured][to]
+        elif kind == PAWN and to == self.ep:
+            # en passant removes the pawn behind the target square
+            behind = to + (8 if self.side == WHITE else -8)
+            key ^= z[sq[behind]][behind]
+            sq[behind] = EMPTY
+        moved = (piece & COLOR_MASK) | promo if promo else piece
+        sq[to] = moved
+        key ^= z[moved][to]
+
+        if kind == KING and abs(to - frm) == 2:
+            # castling also moves the rook
+            rook_from, rook_to = (frm + 3, frm + 1) if to > frm else (frm - 4, frm - 1)
+            rook = sq[rook_from]
+            sq[rook_to], sq[rook_from] = rook, EMPTY
+            key ^= z[rook][rook_from] ^ z[rook][rook_to]
+
+        ep = -1
+        if kind == PAWN and abs(to - frm) == 16:
+            ep = _ep_target(sq, frm, to, piece & COLOR_MASK)
+        castling = self.castling & _CASTLING_KEEP[frm] & _CASTLING_KEEP[to]
+        key ^= (ZOBRIST_CASTLING[self.castling] ^ ZOBRIST_CASTLING[castling]
+                ^ ZOBRIST_EP[self.ep % 8 if self.ep >= 0 else -1]
+                ^ ZOBRIST_EP[ep % 8 if ep >= 0 else -1] ^ ZOBRIST_SIDE)
+        self.ep = ep
+        self.castling = castling
+        self.side ^= COLOR_MASK
+        self.key = key
+        return undo
+
+    def unmake(self, move, undo, key):
+        """Take back move given make's undo record and the key from before it."""
+        sq = self.squares
+        frm, to, promo = (move >> 6) & 63, move & 63, move >> 12
+        self.side ^= COLOR_MASK
+        self.castling = (undo >> 4) & 15
+        self.ep = ((undo >> 8) & 127) - 1
+        self.key = key
+        moved = sq[to]
+        piece = (moved & COLOR_MASK) | PAWN if promo else moved
+        sq[frm] = piece
+        sq[to] = undo & 15
+
+        kind = piece & TYPE_MASK
+        if kind == PAWN and to == self.ep:
+            sq[to + (8 if self.side == WHITE else -8)] = (self.side ^ COLOR_MASK) | PAWN
+        elif kind == KING and abs(to - frm) == 2:
+            rook_from, rook_to = (frm + 3, frm + 1) if to > frm else (frm - 4, frm - 1)
+            sq[rook_from], sq[rook_to] = sq[rook_to], EMPTY
+
+
+def _ep_target(squares, frm, to, mover):
+    """
+    En passant square of mover's double push from frm to to (already on
+    squares), or -1 when no capture there is legal. Only a capturable
+    square is kept in the position and its key, so positions that differ
+    by a dead en passant square count as repetitions.
+    """
+    ep = (frm + to) // 2
+    capturer = (mover ^ COLOR_MASK) | PAWN
+    col = to & 7
+    for sq in (to - 1 if col else -1, to + 1 if col < 7 else -1):
+        if sq < 0 or squares[sq] != capturer:
+            continue
+        # the capture empties both pawns' squares, which can uncover the
+        # capturer's king
+        pushed = squares[to]
+        squares[sq] = squares[to] = EMPTY
+        squares[ep] = capturer
+        ksq = movegen.king_square(squares, mover ^ COLOR_MASK)
+        legal = ksq < 0 or not movegen.is_attacked(squares, ksq, mover)
+        squares[ep] = EMPTY
+        squares[sq], squares[to] = capturer, pushed
+        if legal:
+            return ep
+    return -1
+
+
+# castling right tied to each rook home square
+_ROOK_RIGHTS = {63: WHITE_KINGSIDE, 56: WHITE_QUEENSIDE,
+                7: BLACK_KINGSIDE, 0: BLACK_QUEENSIDE}
+
+# rights that survive a move touching a square
+_CASTLING_KEEP = [15] * 64
+for _sq, _flag in _ROOK_RIGHTS.items():
+    _CASTLING_KEEP[_sq] = 15 ^ _flag
+_CASTLING_KEEP[60] = 15 ^ (WHITE_KINGSIDE | WHITE_QUEENSIDE)
+_CASTLING_KEEP[4] = 15 ^ (BLACK_KINGSIDE | BLACK_QUEENSIDE)
+
+
+# movegen imports this module, so it is bound only once everything it
+# takes from here is defined; _ep_target looks its helpers up per call
+from classes import movegen  # noqa: E402
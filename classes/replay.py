@@ -0,0 +1,109 @@
+import json
+from collections import deque
+
+import pygame
+
+# the only event types Game reacts to, stored by name in session files
+EVENT_TYPES = {pygame.event.event_name(t): t for t in (
+    pygame.QUIT, pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+    pygame.KEYDOWN, pygame.KEYUP,
+)}
+
+
+def encode_event(event):
+    """JSON-ready dict of an event, None for types Game ignores."""
+    name = pygame.event.event_name(event.type)
+    if name not in EVENT_TYPES:
+        return None
+    data = {"type": name}
+    for key, value in event.dict.items():
+        if isinstance(value, tuple):
+            value = list(value)
+        if isinstance(value, (bool, int, float, str, list)) or value is None:
+            data[key] = value
+    return data
+
+
+def decode_event(data):
+    attrs = {k: tuple(v) if isinstance(v, list) else v for k, v in data.items() if k != "type"}
+    return pygame.event.Event(EVENT_TYPES[data["type"]], attrs)
+
+
+def encode_move(move):
+    return [list(move[0]), list(move[1]), move[2]] if move else None
+
+
+def decode_move(data):
+    # sessions recorded before moves carried the promotion piece have two items
+    return (tuple(data[0]), tuple(data[1]), data[2] if len(data) > 2 else 0) if data else None
+
+
+class SessionRecorder:
+    """
+    Writes a game session as JSON Lines for replay.py.
+
+    The header line holds the window layout and the clock readings taken
+    while the game was set up; then one line per frame holds the input
+    events handled that frame, every value the clock returned and the
+    AI's move if it made one. Clock readings are the only other input
+    Game depends on, so feeding them back makes a replay take exactly
+    the same branches.
+    """
+
+    def __init__(self, path, board_size, menu_width):
+        self.file = open(path, "w")
+        self.layout = {"board": board_size, "menu": menu_width}
+        self.readings = []
+        self.ai_moves = []
+
+    def ticks(self):
+        now = pygame.time.get_ticks()
+        self.readings.append(now)
+        return now
+
+    def ai_move(self, move):
+        self.ai_moves.append(encode_move(move))
+
+    def start(self):
+        """Write the header once the game is set up."""
+        self._write(dict(self.layout, version=1, ticks=self.readings))
+
+    def end_frame(self, events):
+        frame = {"events": [e for e in map(encode_event, events) if e], "ticks": self.readings}
+        if self.ai_moves:
+            frame["ai"] = self.ai_moves
+        self._write(frame)
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.readings = []
+        self.ai_moves = []
+
+    def close(self):
+        self.file.close()
+
+
+class VirtualClock:
+    """
+    Stands in for pygame.time.get_ticks during a replay, returning the
+    recorded readings in order. A replay that asks for more readings
+    than were recorded gets the last value again; missed counts those.
+    """
+
+    def __init__(self):
+        self.readings = deque()
+        self.now = 0
+        self.missed = 0
+        self.unused = 0
+
+    def load(self, readings):
+        # readings the previous frame did not ask for mean the replay diverged
+        self.unused += len(self.readings)
+        self.readings = deque(readings)
+
+    def __call__(self):
+        if self.readings:
+            self.now = self.readings.popleft()
+        else:
+            self.missed += 1
+        return self.now
@@ -7,9 +7,9 @@ class SideMenu:
         self.height = screen_height
         self.x_offset = board_width
 
-        # fonts
-        self.font_large = pygame.font.SysFont(None, 28)
-        self.font_small = pygame.font.SysFont(None, 20)
+        # fonts (default font directly, SysFont scans system fonts first)
+        self.font_large = pygame.font.Font(None, 28)
+        self.font_small = pygame.font.Font(None, 20)
 
         # buttons: mode, difficulty, and others
         labels = [
@@ -18,6 +18,9 @@ class SideMenu:
             "Easy",
             "Medium",
             "Hard",
+            "Hint",
+            "Undo",
+            "Redo",
             "Pause",
             "Restart",
             "Quit"
@@ -78,6 +81,9 @@ class SideMenu:
             elif label == "Pause" and game.paused:
                 bg = (200, 200, 100)
 
+            elif label == "Hint" and game.show_hints:
+                bg = (100, 200, 100)
+
             pygame.draw.rect(screen, bg, rect)
             txt = self.font_small.render(label, True, (0, 0, 0))
             screen.blit(txt, txt.get_rect(center=rect.center))
@@ -102,6 +108,15 @@ class SideMenu:
             elif label == "Pause":
                 game.paused = not game.paused
 
+            elif label == "Hint":
+                game.toggle_hints()
+
+            elif label == "Undo":
+                game.undo_move()
+
+            elif label == "Redo":
+                game.redo_move()
+
             elif label == "Mode: 1v1":
                 game.mode = "1v1"
                 game.start_game()
@@ -0,0 +1,104 @@
+import math
+
+import pygame
+
+from classes.board import Board
+from classes.position import IMAGE_KEYS
+
+BACKGROUND = (40, 40, 40)
+CAPTION_COLOR = (220, 220, 220)
+
+
+class BoardWall:
+    """
+    Many boards tiled in one window, for spectators.
+
+    Tiles are as large as the window allows for the board count, rounded
+    down to a multiple of 8 pixels. All tiles share one set of sprites
+    scaled to the tile size, taken from a Board atlas of that size, so
+    the pre-scaled atlas is built once and cached on disk like the main
+    board's. Each tile remembers the squares and caption it last drew;
+    draw() repaints only tiles that changed since and returns their
+    rects for pygame.display.update.
+    """
+
+    # sprite sets by tile size, shared by every wall in the process
+    _sprites = {}
+
+    def __init__(self, screen, count, gap=6):
+        self.screen = screen
+        self.count = count
+        self.gap = gap
+        self.font = pygame.font.Font(None, 18)
+        self.caption_h = self.font.get_linesize() + 2
+        self.squares = [None] * count     # what each tile should show
+        self.captions = [""] * count
+        self.repaints = 0                 # tiles painted so far
+        self.layout(screen.get_width(), screen.get_height())
+
+    def layout(self, width, height):
+        """Pick the grid with the largest tiles for width x height and repaint all."""
+        gap, n = self.gap, self.count
+        best = None
+        for cols in range(1, n + 1):
+            rows = math.ceil(n / cols)
+            size = min((width - gap * (cols + 1)) // cols,
+                       (height - gap * (rows + 1)) // rows - self.caption_h)
+            size -= size % 8
+            if best is None or size > best[0]:
+                best = (size, cols)
+        self.tile, self.cols = max(best[0], 8), best[1]
+        self.sprites = self._sprite_set(self.tile)
+        self.origins = []
+        for i in range(n):
+            row, col = divmod(i, self.cols)
+            self.origins.append((gap + col * (self.tile + gap),
+                                 gap + row * (self.tile + self.caption_h + gap)))
+        self.drawn = [None] * n       # (squares, caption) last painted per tile
+        self.full_redraw = True
+
+    def _sprite_set(self, size):
+        board = self._sprites.get(size)
+        if board is None:
+            board = self._sprites[size] = Board(self.screen, size, size)
+        return board
+
+    def set_position(self, index, squares, caption=None):
+        """Show squares (a Position's squares) on tile index, optionally with a caption."""
+        self.squares[index] = bytes(squares)
+        if caption is not None:
+            self.captions[index] = caption
+
+    def draw(self):
+        """Repaint changed tiles; returns the rects that need updating."""
+        dirty = []
+        if self.full_redraw:
+            self.screen.fill(BACKGROUND)
+        for i in range(self.count):
+            state = (self.squares[i], self.captions[i])
+            if state != self.drawn[i]:
+                dirty.append(self._draw_tile(i))
+                self.drawn[i] = state
+        if self.full_redraw:
+            self.full_redraw = False
+            return [self.screen.get_rect()]
+        return dirty
+
+    def _draw_tile(self, i):
+        self.repaints += 1
+        x, y = self.origins[i]
+        size = self.tile
+        sq_size = size // 8
+        images = self.sprites.piece_images
+        blits = [(self.sprites.board_image, (x, y))]
+        squares = self.squares[i]
+        if squares is not None:
+            blits.extend((images[IMAGE_KEYS[code]], (x + (sq & 7) * sq_size, y + (sq >> 3) * sq_size))
+                         for sq, code in enumerate(squares) if code)
+        self.screen.blits(blits, False)
+        caption_rect = pygame.Rect(x, y + size, size, self.caption_h)
+        self.screen.fill(BACKGROUND, caption_rect)
+        if self.captions[i]:
+            text = self.font.render(self.captions[i], True, CAPTION_COLOR)
+            self.screen.blit(text, (x + 2, y + size + 1), (0, 0, size - 2, self.caption_h))
+        return pygame.Rect(x, y, size, size + self.caption_h)
@@ -1,9 +1,19 @@
-import pygame
+import time
+_START = time.perf_counter()
+
 import sys
+import pygame
 from classes.game import Game
 
+# time from process start to the first frame on screen
+STARTUP_TARGET_MS = 500
+
 def main():
+    profile = "--startup-profile" in sys.argv[1:]
+    marks = [("imports", time.perf_counter())]
+
     pygame.init()
+    marks.append(("pygame.init", time.perf_counter()))
 
     BOARD_SIZE = 800
     MENU_WIDTH = 200
@@ -12,23 +22,66 @@ def main():
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Enhanced Chess Game for Beginners")
     clock = pygame.time.Clock()
+    marks.append(("window", time.perf_counter()))
 
-    game = Game(screen, BOARD_SIZE, BOARD_SIZE, MENU_WIDTH)
+    recorder = None
+    if "--record" in sys.argv[1:]:
+        # imported here so normal startup does not pay for it
+        from classes.replay import SessionRecorder
+        recorder = SessionRecorder(sys.argv[sys.argv.index("--record") + 1],
+                                   BOARD_SIZE, MENU_WIDTH)
+
+    game = Game(screen, BOARD_SIZE, BOARD_SIZE, MENU_WIDTH,
+                recorder.ticks if recorder else None)
+    game.recorder = recorder
     game.start_game()
+    if recorder:
+        recorder.start()
+    marks.append(("game + assets", time.perf_counter()))
 
     running = True
+    first_frame = True
     while running:
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             game.process_input(event)
 
         game.update_game()
         pygame.display.flip()
+        if recorder:
+            recorder.end_frame(events)
+
+        if first_frame:
+            first_frame = False
+            marks.append(("first frame", time.perf_counter()))
+            if profile:
+                ok = report_startup(marks)
+                pygame.quit()
+                sys.exit(0 if ok else 1)
+
         clock.tick(60)
 
+    if game.hint_engine:
+        game.hint_engine.close()
+    if recorder:
+        recorder.close()
     pygame.quit()
     sys.exit()
 
+def report_startup(marks):
+    prev = _START
+    for label, t in marks:
+        print(f"{label:15}{(t - prev) * 1000:8.1f} ms")
+        prev = t
+    total = (marks[-1][1] - _START) * 1000
+    ok = total <= STARTUP_TARGET_MS
+    print(f"{'time to frame':15}{total:8.1f} ms  (target {STARTUP_TARGET_MS} ms: {'ok' if ok else 'over'})")
+    if "numpy" in sys.modules:
+        # not ours to defer: pygame.surfarray imports it with pygame
+        print("imports include numpy, loaded by pygame")
+    return ok
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,141 @@
+"""
+Replay a recorded game session headlessly and profile it.
+
+    python main.py --record session.jsonl       # play, then close the window
+    python replay.py session.jsonl
+    python replay.py session.jsonl --recorded-ai --top 30 --save-profile replay.prof
+
+Feeds the recorded input events and clock readings back through Game
+frame by frame, with SDL's dummy video driver, under cProfile, and
+prints the hotspots, the slowest frames and whether the replay stayed
+on the recorded path. By default the AI searches again, so the profile
+shows engine time and any move that differs from the recorded one is
+reported; with --recorded-ai the recorded moves are played back instead
+and the profile is the UI alone. The shared analysis store, stats.csv
+and hint arrows are left out: all three depend on state outside the
+session file.
+"""
+import argparse
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from classes.game import Game
+from classes.replay import VirtualClock, decode_event, decode_move, encode_move
+
+
+class MoveCheck:
+    """Takes the recorder's place in Game and compares AI moves with the session."""
+
+    def __init__(self):
+        self.expected = []
+        self.frame = 0
+        self.divergences = []
+
+    def ai_move(self, move):
+        expected = self.expected.pop(0) if self.expected else None
+        if move != decode_move(expected):
+            self.divergences.append((self.frame, expected, encode_move(move)))
+
+
+def load_session(path):
+    with open(path) as f:
+        header = json.loads(f.readline())
+        if header.get("version") != 1:
+            raise ValueError(f"{path}: unsupported session version {header.get('version')}")
+        return header, [json.loads(line) for line in f if line.strip()]
+
+
+def replay(header, frames, recorded_ai):
+    """Runs the session; returns (frame times in ms, clock, divergences)."""
+    pygame.init()
+    screen = pygame.display.set_mode((header["board"] + header["menu"], header["board"]))
+    clock = VirtualClock()
+    # readings taken by Game's constructor and start_game
+    clock.load(header["ticks"])
+    game = Game(screen, header["board"], header["board"], header["menu"], ticks=clock)
+    if game.ai.store:
+        game.ai.store.close()
+        game.ai.store = None
+    game.stats_path = os.devnull
+    game.toggle_hints = lambda: None
+    check = MoveCheck()
+    game.recorder = check
+    if recorded_ai:
+        game.ai.compute_move = lambda board: decode_move(check.expected[0]) if check.expected else None
+
+    game.start_game()
+    times = []
+    for number, frame in enumerate(frames):
+        check.frame = number
+        check.expected = list(frame.get("ai", ()))
+        clock.load(frame["ticks"])
+        start = time.perf_counter()
+        for data in frame["events"]:
+            game.process_input(decode_event(data))
+        game.update_game()
+        pygame.display.flip()
+        times.append((time.perf_counter() - start) * 1000)
+        if check.expected:
+            check.divergences.append((number, check.expected[0], None))
+    clock.load(())
+    pygame.quit()
+    return times, clock, check.divergences
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay a recorded session under the profiler")
+    ap.add_argument("session", help="file written by main.py --record")
+    ap.add_argument("--recorded-ai", action="store_true",
+                    help="play the recorded AI moves instead of searching")
+    ap.add_argument("--top", type=int, default=20, help="functions per hotspot table")
+    ap.add_argument("--slowest", type=int, default=10, help="slowest frames to list")
+    ap.add_argument("--save-profile", metavar="PATH", help="write the raw profile for snakeviz/pstats")
+    args = ap.parse_args(argv)
+
+    header, frames = load_session(args.session)
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    times, clock, divergences = replay(header, frames, args.recorded_ai)
+    profiler.disable()
+    secs = time.perf_counter() - start
+
+    if args.save_profile:
+        profiler.dump_stats(args.save_profile)
+    for key in ("tottime", "cumulative"):
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats(key).print_stats(args.top)
+        # drop pstats' preamble, keep the table
+        table = out.getvalue()
+        print(f"== top {args.top} by {key} ==")
+        print(table[table.find("   ncalls"):].rstrip() + "\n")
+
+    print(f"== slowest {args.slowest} frames ==")
+    for number in sorted(range(len(times)), key=times.__getitem__, reverse=True)[:args.slowest]:
+        frame = frames[number]
+        notes = [f"{len(frame['events'])} events"] + (["AI move"] if "ai" in frame else [])
+        print(f"  frame {number:6}  {times[number]:8.1f} ms  {', '.join(notes)}")
+
+    total = sum(times)
+    print(f"\n{len(frames)} frames in {secs:.2f} s, {total / max(len(times), 1):.2f} ms/frame mean"
+          f" (profiled)")
+    print(f"clock readings: {clock.missed} missing, {clock.unused} unused")
+    for number, expected, got in divergences:
+        print(f"frame {number}: AI played {got}, session has {expected}")
+    deterministic = not divergences and not clock.missed and not clock.unused
+    print("replay matched the session" if deterministic else "replay diverged from the session")
+    return 0 if deterministic else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
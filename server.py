@@ -0,0 +1,170 @@
+"""
+Headless game server: many concurrent games in one process, AI turns on
+a shared engine process pool. No pygame, no window.
+
+    python server.py [--host 127.0.0.1] [--port 8765 | --unix PATH]
+                     [--workers 2] [--max-sessions 1000]
+
+Line protocol, one command per line, one reply line each:
+
+    new [white|black] [depth]   ->  ok <id> <ai move|-> <status> <fen>
+    move <id> <uci move>        ->  ok <ai move|-> <status> <fen>
+    show <id>                   ->  ok - <status> <fen>
+    close <id>                  ->  ok
+    stats                       ->  ok sessions <n> pending <n> completed <n>
+
+Errors reply "err <reason>" and leave the connection open. The human
+plays the color given to new (white by default) and the AI answers
+every human move.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+
+from classes.engine_pool import EnginePool
+from classes.position import Position, COLOR_CODES, COLOR_MASK, move_name
+from classes import movegen
+
+DEFAULT_DEPTH = 2
+
+
+class Session:
+    __slots__ = ("pos", "ai_side", "depth")
+
+    def __init__(self, human, depth):
+        self.pos = Position.initial()
+        self.ai_side = COLOR_CODES[human] ^ COLOR_MASK
+        self.depth = depth
+
+    def status(self):
+        if movegen.legal_moves(self.pos):
+            return "ongoing"
+        return "checkmate" if movegen.in_check(self.pos) else "stalemate"
+
+    def play(self, text):
+        """Apply a move in coordinate notation, False if it is not legal."""
+        for mv in movegen.legal_moves(self.pos):
+            if move_name(mv) == text:
+                self.pos = self.pos.play(mv)
+                return True
+        return False
+
+
+class GameServer:
+    def __init__(self, pool, max_sessions=1000):
+        self.pool = pool
+        self.max_sessions = max_sessions
+        self.sessions = {}
+        self.ids = itertools.count(1)
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self.dispatch(line.decode(errors="replace").split())
+                writer.write((reply + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, words):
+        if not words:
+            return "err empty"
+        cmd, args = words[0], words[1:]
+        try:
+            if cmd == "new":
+                return await self.new_game(args)
+            if cmd == "stats":
+                return (f"ok sessions {len(self.sessions)} pending {self.pool.pending}"
+                        f" completed {self.pool.completed}")
+            if cmd not in ("move", "show", "close"):
+                return "err unknown command"
+            session = self.sessions.get(args[0]) if args else None
+            if session is None:
+                return "err unknown session"
+            if cmd == "move" and len(args) == 2:
+                return await self.human_move(args[0], session, args[1])
+            if cmd == "show":
+                return f"ok - {session.status()} {session.pos.fen()}"
+            if cmd == "close":
+                del self.sessions[args[0]]
+                return "ok"
+        except ValueError as e:
+            return f"err {e}"
+        except Exception as e:
+            # anything else a malformed request trips over is reported
+            # like the checked errors, the connection and the server go on
+            return "err " + " ".join(f"{type(e).__name__}: {e}".split())
+        return "err bad arguments"
+
+    async def new_game(self, args):
+        if len(self.sessions) >= self.max_sessions:
+            return "err server full"
+        human = args[0] if args else "white"
+        if human not in COLOR_CODES:
+            raise ValueError("color must be white or black")
+        depth = int(args[1]) if len(args) > 1 else DEFAULT_DEPTH
+        if depth < 1:
+            raise ValueError("depth must be at least 1")
+        sid = str(next(self.ids))
+        session = Session(human, depth)
+        self.sessions[sid] = session
+        ai_move = await self.ai_turn(sid, session)
+        return f"ok {sid} {ai_move} {session.status()} {session.pos.fen()}"
+
+    async def human_move(self, sid, session, text):
+        if session.pos.side == session.ai_side or session.status() != "ongoing":
+            return "err not your turn"
+        if not session.play(text):
+            return "err illegal move"
+        ai_move = await self.ai_turn(sid, session)
+        return f"ok {ai_move} {session.status()} {session.pos.fen()}"
+
+    async def ai_turn(self, sid, session):
+        if session.pos.side != session.ai_side or session.status() != "ongoing":
+            return "-"
+        text = await self.pool.submit(sid, session.pos.fen(), session.depth)
+        # the session may have been closed while the engine was thinking
+        if text is None or self.sessions.get(sid) is not session:
+            return "-"
+        session.play(text)
+        return text
+
+
+async def serve(args):
+    pool = EnginePool(args.workers, args.max_pending)
+    pool.start()
+    server = GameServer(pool, args.max_sessions)
+    if args.unix:
+        listener = await asyncio.start_unix_server(server.handle_client, args.unix)
+    else:
+        listener = await asyncio.start_server(server.handle_client, args.host, args.port)
+    print("listening on", args.unix or f"{args.host}:{args.port}", flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        pool.close()
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Headless multi-session chess server")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", help="listen on a unix socket instead of TCP")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--max-pending", type=int, default=64)
+    ap.add_argument("--max-sessions", type=int, default=1000)
+    return ap.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
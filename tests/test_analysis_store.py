@@ -0,0 +1,33 @@
+from classes import eval_weights
+from classes.ai_player import AI_Player
+from classes.analysis_store import AnalysisStore
+
+
+def test_results_survive_reopening(tmp_path):
+    path = str(tmp_path / "analysis.bin")
+    store = AnalysisStore(path, fingerprint=1)
+    store.store(42, 1234, 0.5, 3)
+    store.close()
+    assert AnalysisStore(path, fingerprint=1).lookup(42, 3) == (0.5, 1234)
+
+
+def test_other_fingerprint_drops_the_log(tmp_path):
+    path = str(tmp_path / "analysis.bin")
+    old = AnalysisStore(path, fingerprint=1)
+    old.store(42, 1234, 0.5, 3)
+    new = AnalysisStore(path, fingerprint=2)
+    assert new.lookup(42, 3) is None
+    new.store(7, 99, 0.1, 2)
+    # the log now belongs to the new fingerprint, the old results are gone
+    assert AnalysisStore(path, fingerprint=1).lookup(42, 3) is None
+    assert AnalysisStore(path, fingerprint=2).lookup(7, 2) == (0.1, 99)
+
+
+def test_fingerprint_follows_the_weights():
+    ai = AI_Player("white")
+    ai.set_weights(dict(eval_weights.DEFAULTS))
+    before = ai.fingerprint()
+    ai.set_weights(dict(eval_weights.DEFAULTS, mobility=0.07))
+    assert ai.fingerprint() != before
+    ai.set_weights(dict(eval_weights.DEFAULTS))
+    assert ai.fingerprint() == before
@@ -0,0 +1,6 @@
+from benchmarks import search
+
+
+def test_search_gate_fails_without_a_baseline(tmp_path, capsys):
+    assert search.main(["--baseline", str(tmp_path / "missing.json"), "--levels", "1"]) == 1
+    assert "no baseline" in capsys.readouterr().out
@@ -0,0 +1,22 @@
+import pytest
+
+from classes import eval_weights
+
+
+def test_missing_file_gives_defaults(tmp_path):
+    assert eval_weights.load(str(tmp_path / "none.json")) == eval_weights.DEFAULTS
+
+
+@pytest.mark.parametrize("text", ['{"pawn": 1.', '{"pawn": "heavy"}', '{"pawn": null}', '{"pawn": [1]}'])
+def test_unreadable_file_gives_defaults(tmp_path, capsys, text):
+    path = tmp_path / "eval_weights.json"
+    path.write_text(text)
+    assert eval_weights.load(str(path)) == eval_weights.DEFAULTS
+    assert "Eval weights error" in capsys.readouterr().err
+
+
+def test_saved_weights_load_back(tmp_path):
+    path = str(tmp_path / "eval_weights.json")
+    weights = dict(eval_weights.DEFAULTS, knight=3.25)
+    eval_weights.save(weights, path)
+    assert eval_weights.load(path) == weights
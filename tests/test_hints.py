@@ -0,0 +1,47 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+from classes.hints import HintEngine
+from classes.position import Position
+
+
+class FailingExecutor:
+    def __init__(self, error):
+        self.error = error
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        future.set_exception(self.error)
+        return future
+
+    def shutdown(self, cancel_futures=False):
+        pass
+
+
+def hint_engine(error):
+    engine = HintEngine()
+    engine.executor.shutdown()
+    engine.executor = FailingExecutor(error)
+    return engine
+
+
+def test_failed_search_is_reported_once_and_not_retried(capsys):
+    engine = hint_engine(ValueError("bad position"))
+    pos = Position.initial()
+    for _ in range(3):
+        engine.request(pos)
+        assert engine.get(pos) == []
+    engine.request(Position.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1"))
+    engine.get(pos)
+    assert engine.executor.submitted == 2
+    assert capsys.readouterr().out.count("Hint error") == 1
+
+
+def test_dead_worker_stops_submitting():
+    engine = hint_engine(BrokenProcessPool("worker died"))
+    engine.request(Position.initial())
+    engine.get(Position.initial())
+    engine.request(Position.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1"))
+    assert engine.executor.submitted == 1
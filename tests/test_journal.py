@@ -0,0 +1,54 @@
+from classes.journal import MoveJournal
+from classes.position import Position, encode_move, parse_square
+
+
+def play(journal, line):
+    for text in line.split():
+        journal.push(encode_move(parse_square(text[:2]), parse_square(text[2:4])))
+
+
+def test_threefold_counts_follow_undo_and_redo():
+    journal = MoveJournal()
+    play(journal, "g1f3 g8f6 f3g1 f6g8 g1f3 g8f6 f3g1 f6g8")
+    assert journal.is_threefold()
+    journal.undo()
+    assert not journal.is_threefold()
+    journal.undo()
+    journal.redo()
+    journal.redo()
+    assert journal.is_threefold()
+    assert journal.counts == MoveJournal.from_bytes(journal.to_bytes()).counts
+
+
+def test_push_after_undo_drops_the_undone_line():
+    journal = MoveJournal()
+    play(journal, "g1f3 g8f6 f3g1 f6g8 g1f3 g8f6 f3g1")
+    journal.undo()
+    journal.undo()
+    play(journal, "b8c6")
+    assert not journal.can_redo()
+    assert journal.counts == MoveJournal.from_bytes(journal.to_bytes()).counts
+    assert max(journal.counts.values()) == 2
+
+
+def test_dead_en_passant_square_does_not_split_repetitions():
+    # 1.e4 leaves e3 behind with no black pawn to take there; the knight
+    # shuffles reach the same position twice more without it
+    journal = MoveJournal()
+    play(journal, "e2e4 b8c6 g1f3 c6b8 f3g1 b8c6 g1f3 c6b8 f3g1")
+    assert journal.is_threefold()
+
+
+def test_live_en_passant_square_is_part_of_the_position():
+    # after f7f5 white can take on f6, after the knight shuffle it cannot
+    journal = MoveJournal(Position.from_fen("4k3/5p2/8/4P3/8/8/8/4K1N1 b - - 0 1"))
+    play(journal, "f7f5 g1f3 e8d8 f3g1 d8e8 g1f3 e8d8 f3g1 d8e8")
+    assert not journal.is_threefold()
+
+
+def test_en_passant_square_needs_a_legal_capture():
+    # the b5 pawn may not take on c6, it would uncover its king on the rank
+    pos = Position.from_fen("8/8/8/KPp4r/8/8/8/4k3 w - c6 0 1")
+    assert pos.ep == -1
+    assert pos.key == Position.from_fen("8/8/8/KPp4r/8/8/8/4k3 w - - 0 1").key
+    assert Position.from_fen("8/8/8/1Pp4r/K7/8/8/4k3 w - c6 0 1").ep == parse_square("c6")
@@ -0,0 +1,37 @@
+import pytest
+
+from classes import movegen
+from classes.position import Position
+
+# (label, fen, depth, nodes), counts from the chessprogramming wiki
+PERFT = [
+    ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 4, 197281),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 3, 97862),
+    ("position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 4, 43238),
+    ("position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 3, 9467),
+    ("position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 3, 62379),
+]
+
+
+def perft(pos, depth, bufs):
+    buf = bufs[depth]
+    n = movegen.generate_legal(pos, buf)
+    if depth == 1:
+        return n
+    total = 0
+    for i in range(n):
+        move = buf[i]
+        key = pos.key
+        undo = pos.make(move)
+        total += perft(pos, depth - 1, bufs)
+        pos.unmake(move, undo, key)
+    return total
+
+
+@pytest.mark.parametrize("fen, depth, nodes", [p[1:] for p in PERFT], ids=[p[0] for p in PERFT])
+def test_perft(fen, depth, nodes):
+    pos = Position.from_fen(fen)
+    bufs = [movegen.new_buffer() for _ in range(depth + 1)]
+    assert perft(pos, depth, bufs) == nodes
+    # make/unmake leaves the position as it found it
+    assert pos.fen() == Position.from_fen(fen).fen()
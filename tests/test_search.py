@@ -0,0 +1,54 @@
+import pytest
+
+from classes import eval_weights
+from classes.ai_player import AI_Player
+from classes.position import Position, COLOR_NAMES, encode_move, parse_square
+from benchmarks.positions import SUITE
+
+DEPTH = 3
+
+
+def search(fen, **switches):
+    pos = Position.from_fen(fen)
+    ai = AI_Player(COLOR_NAMES[pos.side], DEPTH)
+    # a tuned eval_weights.json in the repository must not matter
+    ai.set_weights(dict(eval_weights.DEFAULTS))
+    for name, value in switches.items():
+        setattr(ai, name, value)
+    return ai.search_position(pos)
+
+
+@pytest.mark.parametrize("fen", [fen for _, _, fen in SUITE], ids=[label for label, _, _ in SUITE])
+def test_pvs_keeps_score_and_move(fen):
+    plain_score, plain_move = search(fen, use_pvs=False)
+    score, move = search(fen, use_pvs=True)
+    assert move == plain_move
+    assert score == pytest.approx(plain_score)
+
+
+@pytest.mark.parametrize("fen", [fen for _, _, fen in SUITE], ids=[label for label, _, _ in SUITE])
+def test_lazy_eval_keeps_score_and_move(fen):
+    exact_score, exact_move = search(fen, use_lazy_eval=False)
+    score, move = search(fen, use_lazy_eval=True)
+    assert move == exact_move
+    assert score == pytest.approx(exact_score)
+
+
+@pytest.mark.parametrize("fen, text, gain", [
+    # undefended knight
+    ("4k3/8/8/4n3/8/8/8/4R1K1 w - - 0 1", "e1e5", 3),
+    # queen for a pawn guarded by a pawn
+    ("4k3/8/3p4/4p3/8/8/8/4Q1K1 w - - 0 1", "e1e5", -8),
+    # the rook's recapture is answered by the rook behind it
+    ("4k3/4r3/8/4n3/8/8/4R3/4R1K1 w - - 0 1", "e2e5", 3),
+    ("4k3/4r3/8/4n3/8/8/8/4R1K1 w - - 0 1", "e1e5", -2),
+    # the black rook does not guard e5
+    ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5", 1),
+    # knight takes, knight, bishop and queen behind it take back
+    ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", "d3e5", -2),
+])
+def test_see(fen, text, gain):
+    pos = Position.from_fen(fen)
+    ai = AI_Player(COLOR_NAMES[pos.side], DEPTH)
+    ai.set_weights(dict(eval_weights.DEFAULTS))
+    assert ai._see(pos.squares, encode_move(parse_square(text[:2]), parse_square(text[2:4]))) == gain
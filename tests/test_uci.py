@@ -0,0 +1,27 @@
+import io
+
+import pytest
+
+from uci import UCIEngine
+
+
+def go(line):
+    out = io.StringIO()
+    engine = UCIEngine(out)
+    engine.ai.difficulty_level = 1
+    assert engine.handle("position startpos")
+    assert engine.handle(line)
+    engine.wait()
+    return out.getvalue().splitlines()
+
+
+@pytest.mark.parametrize("line", ["go depth", "go depth x", "go movetime", "go nodes 1e3 depth 1",
+                                  "go wtime btime 100", "go depth --1"])
+def test_go_skips_arguments_it_cannot_parse(line):
+    assert go(line)[-1].startswith("bestmove ")
+
+
+def test_go_depth():
+    lines = go("go depth 2")
+    assert lines[-2].startswith("info depth 2 ")
+    assert lines[-1].startswith("bestmove ")
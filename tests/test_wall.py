@@ -0,0 +1,48 @@
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import wall
+
+
+class FailingExecutor:
+    def __init__(self, error):
+        self.error = error
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(self.error)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def self_play(executor, boards=3):
+    feed = wall.SelfPlayFeed(boards, 1, 1, random_plies=0, move_delay=0)
+    feed.executor.shutdown()
+    feed.executor = executor
+    feed.poll()     # submits a search per board
+    return feed
+
+
+def test_failed_search_ends_only_its_boards_game(capsys):
+    feed = self_play(FailingExecutor(ValueError("bad position")))
+    updates = feed.poll()
+    assert [caption.split("  ")[-1] for _, _, caption in updates] == ["engine error"] * 3
+    assert feed.errors == 3
+    assert capsys.readouterr().err.count("Engine error") == 1
+    feed.close()
+
+
+def test_dead_pool_is_replaced_once():
+    broken = FailingExecutor(BrokenProcessPool("worker died"))
+    feed = self_play(broken)
+    feed.poll()
+    assert feed.executor is not broken
+    replacement = feed.executor
+    feed.poll()
+    assert feed.executor is replacement
+    feed.close()
@@ -0,0 +1,242 @@
+"""
+Offline tuning of the evaluation weights against game results (Texel's
+method).
+
+    python tune.py selfplay -o corpus.txt --games 500
+    python tune.py extract corpus.txt -o tuning/
+    python tune.py fit tuning/ -o eval_weights.json
+
+selfplay plays the engine against itself from randomised openings and
+writes every position with the game's result, one "FEN result" line
+each. extract reads such lines (any FEN or EPD line carrying 1-0, 0-1,
+1/2-1/2, or [1.0]/[0.5]/[0.0]) and writes the evaluation terms of every
+position as a float32 matrix, tuning/features.npy, next to the results
+in tuning/results.npy. Both are plain .npy files that fit opens
+memory-mapped, so the corpus can be far larger than RAM.
+
+fit first finds the scale K that best maps the current weights' scores
+to results through sigmoid(K * score), then moves the weights with Adam
+to minimise the mean squared difference between that prediction and the
+result, going over the matrix in chunks for each step. The pawn stays at
+1.0 (--fix) so scores keep the units the search margins are set in.
+AI_Player loads the written file at startup.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from classes import batch_eval, eval_weights, movegen
+from classes.ai_player import AI_Player
+from classes.journal import MoveJournal
+from classes.position import Position, COLOR_NAMES, WHITE, KING, TYPE_MASK
+
+CHUNK = 1 << 16             # positions encoded per batch in extract
+FIT_CHUNK = 1 << 20         # matrix rows per step in fit
+RESULTS = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5, "[1.0]": 1.0, "[0.0]": 0.0, "[0.5]": 0.5}
+
+
+# --- selfplay ---------------------------------------------------------------
+
+def play_game(seed, depth, random_plies, max_plies):
+    """([fen, ...], result) of one engine game, positions after the opening."""
+    rng = random.Random(seed)
+    ai = AI_Player("white", depth)
+    journal = MoveJournal()
+    pos = journal.pos
+    fens = []
+    while True:
+        moves = movegen.legal_moves(pos)
+        if not moves:
+            if not movegen.in_check(pos):
+                return fens, "1/2-1/2"
+            return fens, "0-1" if pos.side == WHITE else "1-0"
+        kings_only = all(not p or p & TYPE_MASK == KING for p in pos.squares)
+        if journal.is_threefold() or len(journal) >= max_plies or kings_only:
+            return fens, "1/2-1/2"
+        if len(journal) < random_plies:
+            move = rng.choice(moves)
+        else:
+            fens.append(pos.fen())
+            ai.color = COLOR_NAMES[pos.side]
+            _, move = ai.search_position(pos, moves)
+        journal.push(move)
+
+
+def selfplay(args):
+    start = time.perf_counter()
+    positions = 0
+    with open(args.output, "w") as out, ProcessPoolExecutor(args.workers) as pool:
+        seeds = range(args.seed, args.seed + args.games)
+        games = pool.map(play_game, seeds, [args.depth] * args.games,
+                         [args.random_plies] * args.games, [args.max_plies] * args.games)
+        for number, (fens, result) in enumerate(games, 1):
+            out.writelines(f"{fen} {result}\n" for fen in fens)
+            positions += len(fens)
+            if number % 10 == 0:
+                print(f"{number} games, {positions} positions", file=sys.stderr)
+    print(f"{args.games} games, {positions} positions in {time.perf_counter() - start:.0f} s",
+          file=sys.stderr)
+
+
+# --- extract ----------------------------------------------------------------
+
+def parse_line(text):
+    """(fen, result from white's side) of a corpus line, None if it has no result."""
+    fields = text.replace(";", " ").replace('"', " ").split()
+    result = next((RESULTS[f] for f in reversed(fields) if f in RESULTS), None)
+    if result is None or len(fields) < 4:
+        return None
+    return " ".join(fields[:4]) + " 0 1", result
+
+
+def extract(args):
+    start = time.perf_counter()
+    # first pass counts, so the matrix can be created at its final size
+    count = 0
+    for path in args.corpus:
+        with open(path) as f:
+            count += sum(1 for line in f if parse_line(line))
+    os.makedirs(args.output, exist_ok=True)
+    features = np.lib.format.open_memmap(os.path.join(args.output, "features.npy"), "w+",
+                                         np.float32, (count, len(batch_eval.FEATURE_NAMES)))
+    results = np.lib.format.open_memmap(os.path.join(args.output, "results.npy"), "w+",
+                                        np.float32, (count,))
+    row = 0
+    positions, outcomes = [], []
+
+    def flush():
+        nonlocal row
+        n = len(positions)
+        features[row:row + n] = batch_eval.features_encoded(batch_eval.encode(positions))
+        results[row:row + n] = outcomes
+        row += n
+        positions.clear()
+        outcomes.clear()
+
+    for path in args.corpus:
+        with open(path) as f:
+            for number, line in enumerate(f, 1):
+                parsed = parse_line(line)
+                if parsed is None:
+                    continue
+                try:
+                    positions.append(Position.from_fen(parsed[0]))
+                except (ValueError, IndexError, KeyError) as e:
+                    raise ValueError(f"{path}:{number}: bad position: {e}") from None
+                outcomes.append(parsed[1])
+                if len(positions) == CHUNK:
+                    flush()
+    if positions:
+        flush()
+    features.flush()
+    results.flush()
+    print(f"{count} positions in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+
+# --- fit --------------------------------------------------------------------
+
+def loss(features, results, weights, k):
+    """Mean squared error of sigmoid(k * score) against results, chunked."""
+    total = 0.0
+    for lo in range(0, len(results), FIT_CHUNK):
+        predicted = 1 / (1 + np.exp(-k * (features[lo:lo + FIT_CHUNK] @ weights)))
+        total += np.square(results[lo:lo + FIT_CHUNK] - predicted).sum()
+    return total / len(results)
+
+
+def gradient(features, results, weights, k):
+    grad = np.zeros_like(weights)
+    for lo in range(0, len(results), FIT_CHUNK):
+        x = features[lo:lo + FIT_CHUNK]
+        predicted = 1 / (1 + np.exp(-k * (x @ weights)))
+        error = (predicted - results[lo:lo + FIT_CHUNK]) * predicted * (1 - predicted)
+        grad += x.T @ error
+    return grad * (2 * k / len(results))
+
+
+def fit_k(features, results, weights, lo=0.01, hi=4.0):
+    # golden section search, the loss is unimodal in k
+    ratio = (5 ** 0.5 - 1) / 2
+    while hi - lo > 1e-4:
+        a, b = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+        if loss(features, results, weights, a) < loss(features, results, weights, b):
+            hi = b
+        else:
+            lo = a
+    return (lo + hi) / 2
+
+
+def fit(args):
+    features = np.load(os.path.join(args.data, "features.npy"), mmap_mode="r")
+    results = np.load(os.path.join(args.data, "results.npy"), mmap_mode="r")
+    if not len(results):
+        print("no positions to fit", file=sys.stderr)
+        return 1
+    names = batch_eval.FEATURE_NAMES
+    start_weights = eval_weights.load(args.start)
+    weights = np.array(eval_weights.key(start_weights))
+    free = np.array([name not in args.fix for name in names])
+
+    k = args.k or fit_k(features, results, weights)
+    print(f"{len(results)} positions, K = {k:.4f}, loss {loss(features, results, weights, k):.6f}",
+          file=sys.stderr)
+
+    # Adam, the terms differ in scale by two orders of magnitude
+    m = np.zeros_like(weights)
+    v = np.zeros_like(weights)
+    beta1, beta2 = 0.9, 0.999
+    for step in range(1, args.iterations + 1):
+        grad = gradient(features, results, weights, k) * free
+        m = beta1 * m + (1 - beta1) * grad
+        v = beta2 * v + (1 - beta2) * grad * grad
+        weights -= args.rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + 1e-12)
+        if step % 25 == 0 or step == args.iterations:
+            print(f"step {step:5d}  loss {loss(features, results, weights, k):.6f}", file=sys.stderr)
+
+    tuned = dict(zip(names, weights.tolist()))
+    for name in names:
+        print(f"  {name:10}{start_weights[name]:9.4f} -> {tuned[name]:9.4f}", file=sys.stderr)
+    eval_weights.save(tuned, args.output)
+    print(f"wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Tune the evaluation weights on game results")
+    commands = ap.add_subparsers(dest="command", required=True)
+
+    play = commands.add_parser("selfplay", help="write positions of engine games with results")
+    play.add_argument("-o", "--output", required=True)
+    play.add_argument("--games", type=int, default=100)
+    play.add_argument("--depth", type=int, default=1)
+    play.add_argument("--random-plies", type=int, default=8, help="random moves to open each game")
+    play.add_argument("--max-plies", type=int, default=200, help="adjudicate a draw after this")
+    play.add_argument("--seed", type=int, default=1)
+    play.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+
+    ext = commands.add_parser("extract", help="write the feature matrix of a corpus")
+    ext.add_argument("corpus", nargs="+", help="files with one FEN/EPD and result per line")
+    ext.add_argument("-o", "--output", required=True, help="directory for the .npy files")
+
+    tune = commands.add_parser("fit", help="fit the weights to the extracted results")
+    tune.add_argument("data", help="directory written by extract")
+    tune.add_argument("-o", "--output", default=eval_weights.DEFAULT_PATH)
+    tune.add_argument("--start", default=eval_weights.DEFAULT_PATH,
+                      help="weights to start from (defaults when missing)")
+    tune.add_argument("--iterations", type=int, default=300)
+    tune.add_argument("--rate", type=float, default=0.01)
+    tune.add_argument("--k", type=float, help="fixed sigmoid scale instead of fitting it")
+    tune.add_argument("--fix", nargs="*", default=["pawn"], choices=eval_weights.NAMES,
+                      help="weights left unchanged")
+    args = ap.parse_args(argv)
+
+    return {"selfplay": selfplay, "extract": extract, "fit": fit}[args.command](args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+UCI engine around AI_Player, for GUIs, match runners and analysis tools.
+
+    python uci.py
+
+The AI_Player, its tables and numpy stay loaded between positions, so
+only the first "go" pays for warm-up. Supports position startpos/fen
+with moves, go depth/movetime/nodes/wtime/btime/infinite, stop and
+quit, and prints info lines with depth, score, nodes and nps.
+"""
+import sys
+import time
+import threading
+
+from classes.ai_player import AI_Player
+from classes.position import Position, COLOR_NAMES, WHITE, move_name
+from classes import movegen
+
+ENGINE_NAME = "EnhancedChess"
+MAX_DEPTH = 64
+MOVES_TO_GO = 30   # share of the clock spent per move when only times are given
+
+
+class UCIEngine:
+    def __init__(self, out=sys.stdout):
+        self.out = out
+        self.lock = threading.Lock()
+        self.ai = AI_Player("white", 3)
+        self.pos = Position.initial()
+        self.thread = None
+        # set by stop; a "go infinite" search holds its bestmove until then
+        self.stop_requested = threading.Event()
+
+    def send(self, line):
+        with self.lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    def handle(self, line):
+        """Process one command line; False once the engine should exit."""
+        words = line.split()
+        if not words:
+            return True
+        cmd, args = words[0], words[1:]
+
+        if cmd == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send("id author StewedDuck")
+            self.send("uciok")
+        elif cmd == "isready":
+            self.send("readyok")
+        elif cmd == "ucinewgame":
+            self.wait()
+            self.pos = Position.initial()
+        elif cmd == "position":
+            self.wait()
+            self.pos = self.parse_position(args)
+        elif cmd == "go":
+            self.wait()
+            self.go(args)
+        elif cmd == "stop":
+            self.stop()
+        elif cmd == "quit":
+            self.stop()
+            return False
+        return True
+
+    def parse_position(self, args):
+        if args and args[0] == "fen":
+            end = args.index("moves") if "moves" in args else len(args)
+            pos = Position.from_fen(" ".join(args[1:end]))
+        else:
+            pos = Position.initial()
+        if "moves" in args:
+            for text in args[args.index("moves") + 1:]:
+                legal = {move_name(mv): mv for mv in movegen.legal_moves(pos)}
+                if text not in legal:
+                    self.send(f"info string illegal move {text}")
+                    break
+                pos = pos.play(legal[text])
+        return pos
+
+    def go(self, args):
+        opts = {}
+        for key in ("depth", "movetime", "nodes", "wtime", "btime", "winc", "binc"):
+            if key not in args:
+                continue
+            # a missing or malformed value drops the argument, it must not
+            # take the engine down
+            try:
+                opts[key] = int(args[args.index(key) + 1])
+            except (ValueError, IndexError):
+                pass
+
+        depth = opts.get("depth", MAX_DEPTH)
+        movetime = opts["movetime"] / 1000 if "movetime" in opts else None
+        clock = opts.get("wtime" if self.pos.side == WHITE else "btime")
+        if movetime is None and clock is not None:
+            inc = opts.get("winc" if self.pos.side == WHITE else "binc", 0)
+            movetime = (clock / MOVES_TO_GO + inc * 0.8) / 1000
+        if "depth" not in opts and movetime is None and "nodes" not in opts and "infinite" not in args:
+            depth = self.ai.difficulty_level
+
+        self.ai.stopped = False
+        self.stop_requested.clear()
+        self.thread = threading.Thread(
+            target=self.search, args=(self.pos, depth, movetime, opts.get("nodes"), "infinite" in args),
+            daemon=True)
+        self.thread.start()
+
+    def search(self, pos, depth, movetime, nodes, infinite=False):
+        ai = self.ai
+        ai.color = COLOR_NAMES[pos.side]
+        ai.nodes = 0
+        start = time.perf_counter()
+
+        def report(d, score, move):
+            elapsed = time.perf_counter() - start
+            nps = int(ai.nodes / elapsed) if elapsed > 0 else 0
+            self.send(f"info depth {d} score cp {round(score * 100)} nodes {ai.nodes}"
+                      f" nps {nps} time {int(elapsed * 1000)} pv {move_name(move)}")
+
+        moves = movegen.legal_moves(pos)
+        move = None
+        if moves:
+            _, move = ai.search_position(pos, moves, depth=depth, movetime=movetime,
+                                         nodes=nodes, on_iteration=report)
+        if infinite:
+            # UCI: after "go infinite" bestmove only follows stop, even
+            # when the search has run out of depth before
+            self.stop_requested.wait()
+        self.send(f"bestmove {move_name(move)}" if move is not None else "bestmove 0000")
+
+    def wait(self):
+        # commands arriving mid-search queue behind it, only stop cuts it
+        # short (and ends a "go infinite")
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def stop(self):
+        if self.thread is not None:
+            self.ai.stopped = True
+            self.stop_requested.set()
+        self.wait()
+
+
+def main():
+    engine = UCIEngine()
+    for line in sys.stdin:
+        if not engine.handle(line):
+            break
+    engine.stop()
+
+if __name__ == "__main__":
+    main()
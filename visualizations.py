@@ -1,28 +1,29 @@
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
+import sys
+import csv
+import statistics
 
-def main():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    csv_path = os.path.join(script_dir, 'stats.csv')
-    if not os.path.exists(csv_path):
-        print(f"Error: Cannot find {csv_path}")
-        return
+def load_stats(csv_path):
+    with open(csv_path, newline='') as f:
+        return list(csv.DictReader(f))
 
-    # Load the data
-    df = pd.read_csv(csv_path)
-
-    # 1) Summary of Average Move Time
-    summary = df['avg_move_time'].agg(['min','max','mean','std'])
+def print_summary(rows):
+    times = [float(r['avg_move_time']) for r in rows]
     print("\nSummary of Average Move Time:")
-    print(f"  Minimum : {summary['min']:.2f} s")
-    print(f"  Maximum : {summary['max']:.2f} s")
-    print(f"  Average : {summary['mean']:.2f} s")
-    print(f"  StdDev  : {summary['std']:.2f} s")
+    print(f"  Minimum : {min(times):.2f} s")
+    print(f"  Maximum : {max(times):.2f} s")
+    print(f"  Average : {statistics.mean(times):.2f} s")
+    print(f"  StdDev  : {statistics.stdev(times) if len(times) > 1 else float('nan'):.2f} s")
+
+def show_plots(rows):
+    # matplotlib is only imported when charts are actually drawn
+    import matplotlib.pyplot as plt
+
+    games = range(1, len(rows) + 1)
 
     # 2) Bar chart: Number of Moves per Game
     plt.figure()
-    plt.bar(df.index + 1, df['move_count'])
+    plt.bar(games, [int(r['move_count']) for r in rows])
     plt.title('Number of Moves per Game')
     plt.xlabel('Game Index')
     plt.ylabel('Total Moves')
@@ -31,7 +32,7 @@ def main():
 
     # 3) Bar chart: Captured Pieces Count per Game
     plt.figure()
-    plt.bar(df.index + 1, df['captures'])
+    plt.bar(games, [int(r['captures']) for r in rows])
     plt.title('Captured Pieces Count per Game')
     plt.xlabel('Game Index')
     plt.ylabel('Captured Pieces')
@@ -40,12 +41,32 @@ def main():
 
     # 4) Line graph: Average Move Time per Game
     plt.figure()
-    plt.plot(df.index + 1, df['avg_move_time'], marker='o')
+    plt.plot(games, [float(r['avg_move_time']) for r in rows], marker='o')
     plt.title('Average Move Time per Game')
     plt.xlabel('Game Index')
     plt.ylabel('Avg Move Time (s)')
     plt.tight_layout()
     plt.show()
 
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    csv_path = os.path.join(script_dir, 'stats.csv')
+    if not os.path.exists(csv_path):
+        print(f"Error: Cannot find {csv_path}")
+        return
+
+    # Load the data
+    rows = load_stats(csv_path)
+    if not rows:
+        print("No games recorded yet")
+        return
+
+    # 1) Summary of Average Move Time
+    print_summary(rows)
+
+    # --summary prints the text summary only, without charts
+    if '--summary' not in sys.argv[1:]:
+        show_plots(rows)
+
 if __name__ == '__main__':
     main()
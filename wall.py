@@ -0,0 +1,253 @@
+"""
+Tournament wall: many live boards in one window.
+
+    python wall.py --boards 32                       # engine games on a process pool
+    tail -f moves.log | python wall.py --boards 16 --feed -
+    python wall.py --boards 48 --frames 600 --headless   # frame time report, no window
+
+Without --feed the wall plays its own AI-vs-AI games: each board opens
+with a few random moves so the games differ, then both sides are played
+by the engine in pool processes, and a finished game restarts after a
+short pause. With --feed the positions come from a file or stdin ("-"),
+one "<board> <fen> [caption]" line per update, boards numbered from 1;
+the last line per board wins.
+
+Only boards whose position changed are repainted and pushed to the
+display, so the frame cost depends on the number of moves per frame, not
+on the number of boards. On exit the frame time report is printed.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import BrokenExecutor
+
+if "--headless" in sys.argv[1:]:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from classes.engine_pool import spawn_executor, engine_move
+from classes.journal import MoveJournal
+from classes.position import Position, COLOR_NAMES, WHITE, move_name
+from classes.wall import BoardWall
+from classes import movegen
+
+FPS = 60
+
+
+class SelfPlayFeed:
+    """
+    Engine games, one per board, with at most one search in flight per
+    board. A search that fails ends only its board's game, which restarts
+    after the usual pause; a dead pool is replaced.
+    """
+
+    def __init__(self, count, depth, workers, random_plies=4, move_delay=0.5, seed=1):
+        self.depth = depth
+        self.workers = workers
+        self.random_plies = random_plies
+        self.move_delay = move_delay
+        self.rng = random.Random(seed)
+        self.executor = spawn_executor(workers)
+        self.errors = 0
+        self.games = [None] * count      # journal per board
+        self.pending = [None] * count    # (pool, future) of the engine move
+        self.wait_until = [0.0] * count  # next move, or restart after a finished game
+        self.results = [None] * count
+        for i in range(count):
+            self._new_game(i)
+
+    def _new_game(self, i):
+        self.games[i] = MoveJournal()
+        self.results[i] = None
+
+    def poll(self):
+        """[(board index, Position, caption)] for boards that changed."""
+        now = time.monotonic()
+        updates = []
+        for i, journal in enumerate(self.games):
+            if now < self.wait_until[i]:
+                continue
+            if self.results[i] is not None:
+                self._new_game(i)
+                updates.append(self._update(i))
+                continue
+            if self.pending[i] is None:
+                self._start_move(i)
+                continue
+            pool, future = self.pending[i]
+            if not future.done():
+                continue
+            self.pending[i] = None
+            error = future.exception()
+            if error is not None:
+                self._fail(i, pool, error, now)
+                updates.append(self._update(i))
+                continue
+            name = future.result()
+            move = next((m for m in movegen.legal_moves(journal.pos) if move_name(m) == name), None)
+            if move is not None:
+                journal.push(move)
+            self._finish_move(i, now)
+            updates.append(self._update(i))
+        return updates
+
+    def _start_move(self, i):
+        journal = self.games[i]
+        if len(journal) < self.random_plies:
+            journal.push(self.rng.choice(movegen.legal_moves(journal.pos)))
+            self.wait_until[i] = time.monotonic() + self.move_delay
+            return
+        self.pending[i] = (self.executor,
+                           self.executor.submit(engine_move, journal.pos.fen(), self.depth))
+
+    def _fail(self, i, pool, error, now):
+        if not self.errors:
+            print("Engine error:", error, file=sys.stderr)
+        self.errors += 1
+        self.results[i] = "engine error"
+        self.wait_until[i] = now + 5.0
+        if isinstance(error, BrokenExecutor) and pool is self.executor:
+            # every search in flight on it fails too; the next ones get a new pool
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = spawn_executor(self.workers)
+
+    def _finish_move(self, i, now):
+        pos = self.games[i].pos
+        self.wait_until[i] = now + self.move_delay
+        if not movegen.legal_moves(pos):
+            if movegen.in_check(pos):
+                self.results[i] = "0-1" if pos.side == WHITE else "1-0"
+            else:
+                self.results[i] = "1/2-1/2 stalemate"
+        elif self.games[i].is_threefold() or len(self.games[i]) >= 300:
+            self.results[i] = "1/2-1/2"
+        if self.results[i] is not None:
+            self.wait_until[i] = now + 5.0
+
+    def _update(self, i):
+        journal = self.games[i]
+        status = self.results[i] or f"{COLOR_NAMES[journal.pos.side]} to move"
+        return i, journal.pos, f"#{i + 1}  move {len(journal) // 2 + 1}  {status}"
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+class LineFeed:
+    """"<board> <fen> [caption]" lines read from a stream on a background thread."""
+
+    def __init__(self, stream, count):
+        self.count = count
+        self.latest = {}
+        self.lock = threading.Lock()
+        self.errors = 0
+        threading.Thread(target=self._read, args=(stream,), daemon=True).start()
+
+    def _read(self, stream):
+        for line in stream:
+            words = line.split()
+            if len(words) < 7 or not words[0].isdigit():
+                continue
+            number = int(words[0])
+            if not 1 <= number <= self.count:
+                continue
+            caption = " ".join(words[7:]) or f"#{number}"
+            with self.lock:
+                self.latest[number - 1] = (" ".join(words[1:7]), caption)
+
+    def poll(self):
+        with self.lock:
+            latest, self.latest = self.latest, {}
+        updates = []
+        for i, (fen, caption) in latest.items():
+            try:
+                updates.append((i, Position.from_fen(fen), caption))
+            except (ValueError, IndexError, KeyError):
+                self.errors += 1
+        return updates
+
+    def close(self):
+        pass
+
+
+def report(times, repaints, frames):
+    if not times:
+        return
+    times.sort()
+    budget = 1000 / FPS
+    print(f"{frames} frames, busy time per frame: mean {sum(times) / len(times):.2f} ms,"
+          f" 99th percentile {times[int(len(times) * 0.99)]:.2f} ms,"
+          f" max {times[-1]:.2f} ms (budget {budget:.1f} ms)")
+    print(f"{repaints / frames:.2f} boards repainted per frame,"
+          f" {sum(t > budget for t in times)} frames over budget")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Show many live boards in one window")
+    ap.add_argument("--boards", type=int, default=32)
+    ap.add_argument("--size", default="1600x900", help="window size WIDTHxHEIGHT")
+    ap.add_argument("--feed", help='file or "-" with "<board> <fen> [caption]" lines')
+    ap.add_argument("--depth", type=int, default=1, help="engine depth for self-play")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--move-delay", type=float, default=0.5, help="seconds between moves per board")
+    ap.add_argument("--frames", type=int, help="exit after this many frames")
+    ap.add_argument("--headless", action="store_true", help="no window (SDL dummy driver)")
+    args = ap.parse_args(argv)
+    width, height = (int(v) for v in args.size.lower().split("x"))
+
+    pygame.init()
+    screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+    pygame.display.set_caption(f"Tournament wall - {args.boards} boards")
+    wall = BoardWall(screen, args.boards)
+    if args.feed:
+        source = sys.stdin if args.feed == "-" else open(args.feed)
+        feed = LineFeed(source, args.boards)
+    else:
+        feed = SelfPlayFeed(args.boards, args.depth, args.workers, move_delay=args.move_delay)
+    start = Position.initial()
+    for i in range(args.boards):
+        wall.set_position(i, start.squares, f"#{i + 1}")
+
+    clock = pygame.time.Clock()
+    times = []
+    frames = 0
+    running = True
+    try:
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.type == pygame.VIDEORESIZE:
+                    wall.layout(event.w, event.h)
+            begin = time.perf_counter()
+            for i, pos, caption in feed.poll():
+                wall.set_position(i, pos.squares, caption)
+            dirty = wall.draw()
+            if dirty:
+                pygame.display.update(dirty)
+            times.append((time.perf_counter() - begin) * 1000)
+            frames += 1
+            if args.frames and frames >= args.frames:
+                break
+            clock.tick(FPS)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        feed.close()
+        pygame.quit()
+    # the first frame paints the whole window, it is not part of the steady state
+    report(times[1:], wall.repaints, frames)
+    if feed.errors:
+        print(f"{feed.errors} feed errors")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())